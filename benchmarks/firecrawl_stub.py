@@ -0,0 +1,154 @@
+"""Local stand-in for the Firecrawl crawl API.
+
+Emulates ``POST /v2/crawl`` and ``GET /v2/crawl/{id}`` closely enough for
+``FirecrawlRepository`` to run against it: jobs report ``scraping`` until
+their latency has elapsed, then serve synthetic pages through paginated
+``next`` cursors.
+"""
+
+import itertools
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlparse
+
+
+class FirecrawlStub:
+    """Threaded HTTP server serving synthetic crawl jobs.
+
+    Parameters
+    ----------
+    pages : int, default 100
+        Pages returned by every crawl job, capped by the request's ``limit``
+    page_size : int, default 10_000
+        Approximate size in bytes of each page's markdown and HTML
+    latency : float, default 0.5
+        Seconds a job stays in the ``scraping`` state
+    results_per_page : int, default 10
+        Documents per paginated status response
+    host : str, default "127.0.0.1"
+        Interface to bind
+    port : int, default 0
+        Port to bind, 0 picks a free one
+
+    """
+
+    def __init__(
+        self,
+        pages: int = 100,
+        page_size: int = 10_000,
+        latency: float = 0.5,
+        results_per_page: int = 10,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.pages = pages
+        self.page_size = page_size
+        self.latency = latency
+        self.results_per_page = results_per_page
+        self._jobs: dict[str, dict[str, Any]] = {}
+        self._ids = itertools.count()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FirecrawlStub":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FirecrawlStub":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.stop()
+
+    def _document(self, target_url: str, index: int) -> dict[str, Any]:
+        words = " ".join(f"word{index}-{n}" for n in range(self.page_size // 24))
+        return {
+            "markdown": f"# Page {index}\n\n{words}",
+            "html": f"<html><body><h1>Page {index}</h1><p>{words}</p></body></html>",
+            "links": [f"{target_url}/page/{index + 1}"],
+            "metadata": {
+                "url": f"{target_url}/page/{index}",
+                "title": f"Page {index}",
+                "description": f"Synthetic page {index}",
+                "language": "en",
+                "statusCode": 200,
+            },
+        }
+
+    def _create_job(self, body: dict[str, Any]) -> dict[str, Any]:
+        job_id = str(next(self._ids))
+        self._jobs[job_id] = {
+            "url": body["url"].rstrip("/"),
+            "pages": min(self.pages, body.get("limit") or self.pages),
+            "ready_at": time.monotonic() + self.latency,
+        }
+        return {"success": True, "id": job_id, "url": f"{self.url}/v2/crawl/{job_id}"}
+
+    def _job_status(self, job_id: str, skip: int) -> dict[str, Any]:
+        job = self._jobs[job_id]
+        total = job["pages"]
+        if time.monotonic() < job["ready_at"]:
+            return {
+                "success": True,
+                "status": "scraping",
+                "completed": 0,
+                "total": total,
+                "creditsUsed": 0,
+                "data": [],
+            }
+
+        end = min(skip + self.results_per_page, total)
+        return {
+            "success": True,
+            "status": "completed",
+            "completed": total,
+            "total": total,
+            "creditsUsed": total,
+            "data": [self._document(job["url"], i) for i in range(skip, end)],
+            "next": f"{self.url}/v2/crawl/{job_id}?skip={end}" if end < total else None,
+        }
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+            def _send(self, status: int, body: dict[str, Any]) -> None:
+                payload = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_POST(self) -> None:
+                if urlparse(self.path).path.rstrip("/") != "/v2/crawl":
+                    self._send(404, {"success": False, "error": "Not found"})
+                    return
+                length = int(self.headers.get("Content-Length", 0))
+                self._send(200, stub._create_job(json.loads(self.rfile.read(length))))
+
+            def do_GET(self) -> None:
+                parsed = urlparse(self.path)
+                job_id = parsed.path.rstrip("/").rsplit("/", 1)[-1]
+                if job_id not in stub._jobs:
+                    self._send(404, {"success": False, "error": "Job not found"})
+                    return
+                skip = int(parse_qs(parsed.query).get("skip", ["0"])[0])
+                self._send(200, stub._job_status(job_id, skip))
+
+        return Handler
@@ -1,4 +1,6 @@
-from .settings import Settings
+from .settings import Settings, get_settings
+
+__all__ = ["Settings", "get_settings", "settings"]
 
 # Create a global settings instance
-settings = Settings()
+settings = get_settings()
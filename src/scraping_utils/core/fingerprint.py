@@ -0,0 +1,120 @@
+"""Locality-sensitive page fingerprints for near-duplicate detection.
+
+A 64-bit SimHash summarizes the word shingles of a text so that texts
+differing only in small details, such as a timestamp or an ad slot, get
+fingerprints a few bits apart. ``SimHashIndex`` finds such fingerprints
+without comparing against every stored one.
+"""
+
+import hashlib
+import re
+from collections.abc import Hashable, Iterable
+
+FINGERPRINT_BITS = 64
+
+_WORDS = re.compile(r"\w+")
+
+
+def _shingles(text: str, size: int) -> set[str]:
+    words = _WORDS.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """Compute the 64-bit SimHash of a text's word shingles.
+
+    Parameters
+    ----------
+    text : str
+        Text to fingerprint
+    shingle_size : int, default 3
+        Words per shingle
+
+    Returns
+    -------
+    int
+        Unsigned 64-bit fingerprint, 0 for a text without words
+
+    """
+    shingles = _shingles(text, shingle_size)
+    if not shingles:
+        return 0
+    # One bit string per shingle; counting a column's ones stays in C
+    bits = [
+        format(
+            int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest()),
+            "064b",
+        )
+        for s in shingles
+    ]
+    threshold = len(bits) / 2
+    fingerprint = 0
+    for column in zip(*bits):
+        fingerprint = (fingerprint << 1) | (column.count("1") > threshold)
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return (a ^ b).bit_count()
+
+
+def to_signed(fingerprint: int) -> int:
+    """Map an unsigned fingerprint to the range of a signed 64-bit column."""
+    return fingerprint - (1 << 64) if fingerprint >= 1 << 63 else fingerprint
+
+
+def to_unsigned(value: int) -> int:
+    """Inverse of ``to_signed``."""
+    return value + (1 << 64) if value < 0 else value
+
+
+class SimHashIndex:
+    """LSH band index over SimHash fingerprints.
+
+    Fingerprints are split into ``max_distance + 1`` bands. Two fingerprints
+    at most ``max_distance`` bits apart differ in at most that many bands,
+    so they share at least one band exactly and every match is found by
+    looking up a handful of buckets instead of scanning all fingerprints.
+
+    Parameters
+    ----------
+    max_distance : int, default 3
+        Largest Hamming distance still considered a near-duplicate
+
+    """
+
+    def __init__(self, max_distance: int = 3):
+        self.max_distance = max_distance
+        self.bands = max_distance + 1
+        self._width = -(-FINGERPRINT_BITS // self.bands)
+        self._mask = (1 << self._width) - 1
+        self._buckets: dict[tuple[int, int], list[tuple[Hashable, int]]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _keys(self, fingerprint: int) -> Iterable[tuple[int, int]]:
+        for band in range(self.bands):
+            yield band, (fingerprint >> (band * self._width)) & self._mask
+
+    def add(self, key: Hashable, fingerprint: int) -> None:
+        """Index a fingerprint under a caller-chosen key, e.g. a record id."""
+        for bucket in self._keys(fingerprint):
+            self._buckets.setdefault(bucket, []).append((key, fingerprint))
+        self._size += 1
+
+    def find(self, fingerprint: int) -> tuple[Hashable, int] | None:
+        """Return the closest indexed key and its distance, or None if none is near."""
+        best: tuple[Hashable, int] | None = None
+        for bucket in self._keys(fingerprint):
+            for key, candidate in self._buckets.get(bucket, ()):
+                distance = hamming_distance(fingerprint, candidate)
+                if distance <= self.max_distance and (
+                    best is None or distance < best[1]
+                ):
+                    best = (key, distance)
+        return best
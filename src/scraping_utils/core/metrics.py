@@ -0,0 +1,235 @@
+"""Pluggable instrumentation for the scrape and ingest hot paths.
+
+Library code records timings, counters and value distributions through the
+process-wide ``Metrics`` returned by ``get_metrics``. The default discards
+everything at negligible cost; install a ``PrometheusMetrics`` or
+``OpenTelemetryMetrics`` with ``set_metrics`` to collect them.
+"""
+
+import bisect
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from typing import Any
+
+Labels = tuple[tuple[str, str], ...]
+
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.05,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+    10.0,
+    60.0,
+    300.0,
+)
+
+
+class Metrics:
+    """No-op metrics sink, and the interface every backend implements.
+
+    Names follow Prometheus conventions (``snake_case`` with a unit suffix such
+    as ``_seconds`` or ``_bytes``); labels are passed as keyword arguments.
+    """
+
+    def counter(self, name: str, value: float = 1, **labels: str) -> None:
+        """Add ``value`` to a monotonically increasing counter."""
+
+    def histogram(self, name: str, value: float, **labels: str) -> None:
+        """Record one observation of a value distribution."""
+
+    def timer(self, name: str, **labels: str) -> AbstractContextManager[None]:
+        """Time a block and record its duration in seconds as a histogram."""
+        return nullcontext()
+
+    def timed(self, iterable: Iterable[Any], name: str, **labels: str) -> Iterator[Any]:
+        """Iterate while recording the total time spent producing items."""
+        return iter(iterable)
+
+
+class _TimingMetrics(Metrics):
+    """Base for backends that actually measure time."""
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.histogram(name, time.perf_counter() - start, **labels)
+
+    def timed(self, iterable: Iterable[Any], name: str, **labels: str) -> Iterator[Any]:
+        iterator = iter(iterable)
+        elapsed = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    return
+                finally:
+                    elapsed += time.perf_counter() - start
+                yield item
+        finally:
+            self.histogram(name, elapsed, **labels)
+
+
+class PrometheusMetrics(_TimingMetrics):
+    """In-memory collector exposing the Prometheus text format.
+
+    Parameters
+    ----------
+    buckets : tuple[float, ...], default DEFAULT_BUCKETS
+        Upper bounds of the histogram buckets
+    namespace : str, default "scraping_utils"
+        Prefix added to every exported metric name
+
+    """
+
+    def __init__(
+        self,
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+        namespace: str = "scraping_utils",
+    ):
+        self.buckets = tuple(sorted(buckets))
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[Labels, float]] = {}
+        self._histograms: dict[str, dict[Labels, list[float]]] = {}
+
+    def counter(self, name: str, value: float = 1, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def histogram(self, name: str, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            # Per-bucket counts, then +Inf count and sum
+            state = series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            state[bisect.bisect_left(self.buckets, value)] += 1
+            state[-1] += value
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return counters and histogram count/sum totals, summed over labels."""
+        with self._lock:
+            counters = {
+                name: sum(series.values()) for name, series in self._counters.items()
+            }
+            histograms = {
+                name: {
+                    "count": sum(sum(state[:-1]) for state in series.values()),
+                    "sum": sum(state[-1] for state in series.values()),
+                }
+                for name, series in self._histograms.items()
+            }
+        return {"counters": counters, "histograms": histograms}
+
+    @staticmethod
+    def _format_labels(labels: Labels, extra: tuple[str, str] | None = None) -> str:
+        items = list(labels) + ([extra] if extra else [])
+        if not items:
+            return ""
+        escaped = (
+            (key, value.replace("\\", "\\\\").replace('"', '\\"'))
+            for key, value in items
+        )
+        return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        lines: list[str] = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                full_name = f"{self.namespace}_{name}_total"
+                lines.append(f"# TYPE {full_name} counter")
+                for labels, value in series.items():
+                    lines.append(f"{full_name}{self._format_labels(labels)} {value}")
+
+            for name, series in sorted(self._histograms.items()):
+                full_name = f"{self.namespace}_{name}"
+                lines.append(f"# TYPE {full_name} histogram")
+                for labels, state in series.items():
+                    cumulative = 0.0
+                    for bound, count in zip(self.buckets, state):
+                        cumulative += count
+                        le = self._format_labels(labels, ("le", repr(bound)))
+                        lines.append(f"{full_name}_bucket{le} {cumulative}")
+                    cumulative += state[len(self.buckets)]
+                    le = self._format_labels(labels, ("le", "+Inf"))
+                    lines.append(f"{full_name}_bucket{le} {cumulative}")
+                    label_text = self._format_labels(labels)
+                    lines.append(f"{full_name}_sum{label_text} {state[-1]}")
+                    lines.append(f"{full_name}_count{label_text} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str) -> None:
+        """Write the metrics for a node_exporter textfile collector."""
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+
+
+class OpenTelemetryMetrics(_TimingMetrics):
+    """Forward metrics to an OpenTelemetry meter.
+
+    Requires the ``opentelemetry-api`` package; the configured SDK and
+    exporter decide where the data goes.
+
+    Parameters
+    ----------
+    meter : Any or None, default None
+        OpenTelemetry meter, defaults to the global meter for this library
+
+    """
+
+    def __init__(self, meter: Any | None = None):
+        if meter is None:
+            try:
+                from opentelemetry import metrics as otel_metrics
+            except ImportError as e:
+                raise ImportError(
+                    "OpenTelemetryMetrics requires the 'opentelemetry-api' package."
+                ) from e
+            meter = otel_metrics.get_meter("scraping_utils")
+        self._meter = meter
+        self._lock = threading.Lock()
+        self._instruments: dict[str, Any] = {}
+
+    def _instrument(self, name: str, kind: str) -> Any:
+        with self._lock:
+            instrument = self._instruments.get(name)
+            if instrument is None:
+                if kind == "counter":
+                    instrument = self._meter.create_counter(name)
+                else:
+                    instrument = self._meter.create_histogram(name)
+                self._instruments[name] = instrument
+            return instrument
+
+    def counter(self, name: str, value: float = 1, **labels: str) -> None:
+        self._instrument(name, "counter").add(value, attributes=labels)
+
+    def histogram(self, name: str, value: float, **labels: str) -> None:
+        self._instrument(name, "histogram").record(value, attributes=labels)
+
+
+_metrics: Metrics = Metrics()
+
+
+def get_metrics() -> Metrics:
+    """Get the process-wide metrics sink."""
+    return _metrics
+
+
+def set_metrics(metrics: Metrics | None) -> None:
+    """Install a metrics sink for the process, ``None`` restores the no-op."""
+    global _metrics
+    _metrics = metrics if metrics is not None else Metrics()
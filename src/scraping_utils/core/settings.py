@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import Literal
+
 from pydantic import BaseModel
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -6,6 +9,16 @@ class DatabaseConfig(BaseModel):
     """Database configuration."""
 
     url: str = "sqlite:///./scraped_data.db"
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_pre_ping: bool = True
+    pool_recycle: int = 1800
+    full_text_search: bool = False
+    search_language: str = "simple"
+    partitioned: bool = False
+    partitions_ahead: int = 3
+    retention_days: int | None = None
+    archive_dir: str | None = None
 
 
 class FirecrawlConfig(BaseModel):
@@ -13,6 +26,30 @@ class FirecrawlConfig(BaseModel):
 
     base_url: str = "http://localhost:3002/"
     api_key: str | None = None
+    webhook_enabled: bool = False
+    webhook_host: str = "0.0.0.0"
+    webhook_port: int = 0
+    webhook_public_url: str | None = None
+    checkpoint_dir: str | None = None
+    rate_limit_path: str | None = None
+    rate_limit_per_second: float = 2.0
+    rate_limit_burst: float = 5.0
+    retry_budget: float = 10.0
+    retry_budget_per_second: float = 0.1
+    cache_path: str | None = None
+    cache_ttl: float | None = 86400
+    cache_max_bytes: int = 1 << 30
+
+
+class BlobStoreConfig(BaseModel):
+    """Content-addressed blob store configuration, disabled by default."""
+
+    backend: Literal["filesystem", "s3"] | None = None
+    path: str = "./blobs"
+    bucket: str | None = None
+    prefix: str = "blobs/"
+    endpoint_url: str | None = None
+    level: int = 3
 
 
 class Settings(BaseSettings):
@@ -20,6 +57,7 @@ class Settings(BaseSettings):
 
     db: DatabaseConfig = DatabaseConfig()
     firecrawl: FirecrawlConfig = FirecrawlConfig()
+    blobs: BlobStoreConfig = BlobStoreConfig()
 
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -27,3 +65,13 @@ class Settings(BaseSettings):
         env_nested_delimiter="__",
         extra="ignore",
     )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the settings of this process, loading ``.env`` only once.
+
+    Call ``get_settings.cache_clear()`` to reload them, e.g. after the
+    environment changed.
+    """
+    return Settings()
@@ -0,0 +1,10 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class PageState(BaseModel):
+    """Last known state of a crawled page, used to detect unchanged pages."""
+
+    content_hash: str | None = None
+    last_modified: datetime | None = None
+    etag: str | None = None
@@ -0,0 +1,176 @@
+"""Columnar container moving many website pages without per-page models."""
+
+from collections.abc import Iterable, Iterator, Mapping
+from functools import cache
+from typing import Any
+
+from pydantic import TypeAdapter, ValidationError
+
+from .website import WebsiteEntity
+
+_FIELDS = WebsiteEntity.model_fields
+# Placeholders kept in raw columns: a key absent from the record, and a
+# content_text identical to content_markdown, which is then stored only once
+_MISSING: Any = object()
+_SHARED: Any = object()
+
+
+@cache
+def _column_adapter(name: str) -> TypeAdapter[list[Any]]:
+    return TypeAdapter(list[_FIELDS[name].annotation])
+
+
+class WebsiteBatch:
+    """Batch of website pages stored column by column.
+
+    Building a batch only copies references into one list per field; nothing
+    is validated until a column is read, and each column is then validated
+    in a single pass against the ``WebsiteEntity`` field type and cached.
+    Bulk paths can therefore read the few fields they need without building
+    a pydantic model per page, while ``WebsiteEntity`` objects remain
+    available on demand.
+
+    Parameters
+    ----------
+    columns : dict[str, list[Any]]
+        Raw values per field, all of the same length
+    length : int
+        Number of pages in the batch
+
+    """
+
+    __slots__ = ("_columns", "_length", "_validated")
+
+    def __init__(self, columns: dict[str, list[Any]], length: int):
+        self._columns = columns
+        self._length = length
+        self._validated: dict[str, list[Any]] = {}
+
+    @classmethod
+    def from_records(
+        cls, records: Iterable[Mapping[str, Any]], exclude: Iterable[str] = ()
+    ) -> "WebsiteBatch":
+        """Create a batch from raw records such as decoded artifact items.
+
+        Parameters
+        ----------
+        records : Iterable[Mapping[str, Any]]
+            Records with ``WebsiteEntity`` fields; unknown keys are ignored
+        exclude : Iterable[str], default ()
+            Fields to drop, e.g. ``content_html`` when only text is needed.
+            Excluded fields read back as their default.
+
+        Returns
+        -------
+        WebsiteBatch
+            Unvalidated batch
+
+        """
+        records = list(records)
+        for record in records:
+            if not isinstance(record, Mapping):
+                raise TypeError(f"Expected a mapping, got {type(record).__name__}")
+        excluded = set(exclude)
+        columns = {
+            name: [record.get(name, _MISSING) for record in records]
+            for name in _FIELDS
+            if name not in excluded
+        }
+        if "content_text" in columns and "content_markdown" in columns:
+            columns["content_text"] = [
+                _SHARED if text is not _MISSING and text == markdown else text
+                for text, markdown in zip(
+                    columns["content_text"], columns["content_markdown"]
+                )
+            ]
+        length = len(records)
+        return cls(columns, length)
+
+    @classmethod
+    def from_entities(
+        cls, entities: Iterable[WebsiteEntity], exclude: Iterable[str] = ()
+    ) -> "WebsiteBatch":
+        """Create a batch from existing entities, whose values are trusted."""
+        batch = cls.from_records((entity.__dict__ for entity in entities), exclude)
+        for name in batch._columns:
+            if name != "content_text":
+                batch._validated[name] = batch._columns[name]
+        return batch
+
+    def __len__(self) -> int:
+        return self._length
+
+    def column(self, name: str) -> list[Any]:
+        """Return the validated values of a field, one per page.
+
+        Raises
+        ------
+        KeyError
+            If ``name`` is not a ``WebsiteEntity`` field
+        pydantic.ValidationError
+            If a value does not match the field type, or a required field is
+            missing from a record; errors are located by record index and
+            field name
+
+        """
+        if name in self._validated:
+            return self._validated[name]
+        field = _FIELDS[name]
+        raw = self._columns.get(name, [_MISSING] * self._length)
+        if name == "content_text":
+            markdown = self.column("content_markdown")
+            raw = [
+                markdown[index] if value is _SHARED else value
+                for index, value in enumerate(raw)
+            ]
+        if field.is_required():
+            missing = [index for index, value in enumerate(raw) if value is _MISSING]
+            if missing:
+                raise ValidationError.from_exception_data(
+                    "WebsiteBatch",
+                    [
+                        {"type": "missing", "loc": (index, name), "input": {}}
+                        for index in missing
+                    ],
+                )
+        values = _column_adapter(name).validate_python(
+            [
+                field.get_default(call_default_factory=True)
+                if value is _MISSING
+                else value
+                for value in raw
+            ]
+        )
+        self._validated[name] = values
+        return values
+
+    def __getitem__(self, index: int) -> WebsiteEntity:
+        """Materialize one page as a ``WebsiteEntity``."""
+        if not -self._length <= index < self._length:
+            raise IndexError("WebsiteBatch index out of range")
+        return WebsiteEntity.model_construct(
+            **{name: self.column(name)[index] for name in _FIELDS}
+        )
+
+    def __iter__(self) -> Iterator[WebsiteEntity]:
+        for index in range(self._length):
+            yield self[index]
+
+    def to_entities(self) -> list[WebsiteEntity]:
+        """Materialize every page as a ``WebsiteEntity``."""
+        return list(self)
+
+    def to_records(self, mode: str = "json") -> list[dict[str, Any]]:
+        """Dump the batch as records equal to ``WebsiteEntity.model_dump``.
+
+        Serialization runs column by column, so ``mode="json"`` output can be
+        written to an artifact without touching an entity per page.
+        """
+        columns = {
+            name: _column_adapter(name).dump_python(self.column(name), mode=mode)
+            for name in _FIELDS
+        }
+        return [
+            {name: values[index] for name, values in columns.items()}
+            for index in range(self._length)
+        ]
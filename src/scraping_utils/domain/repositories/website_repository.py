@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from ..entities.website import WebsiteEntity
 
 
@@ -9,6 +10,15 @@ class WebsiteRepository(ABC):
     async def get(self) -> list[WebsiteEntity] | None:
         pass
 
+    async def stream(self) -> AsyncIterator[WebsiteEntity]:
+        """Yield entities one at a time.
+
+        Repositories that can produce results incrementally should override
+        this; the default falls back to ``get``.
+        """
+        for entity in await self.get() or []:
+            yield entity
+
 
 class CrawlingError(Exception):
     """Exception raised when crawling fails."""
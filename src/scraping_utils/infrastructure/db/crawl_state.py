@@ -0,0 +1,67 @@
+"""Lookup of previously ingested page state for incremental crawls."""
+
+from urllib.parse import urlparse
+
+from sqlalchemy import func, select
+from sqlalchemy.sql import ColumnElement, Subquery
+
+from ...domain.entities.page_state import PageState
+from .database import DatabaseConnector
+from .models.scraped_data import ScrapedData
+from .scraped_data_query import domain_clause
+
+
+def latest_rows(*criteria: ColumnElement[bool]) -> Subquery:
+    """Subquery of the latest stored row of each source matching ``criteria``.
+
+    Rows of a source are ranked by ``insertion_date``, then ``id`` for rows
+    inserted at the same instant, and only the first one is kept. Filter on
+    ``source`` or ``source_reverse`` so the ranking only reads the matching
+    index range.
+    """
+    rank = (
+        func.row_number()
+        .over(
+            partition_by=ScrapedData.source,
+            order_by=(ScrapedData.insertion_date.desc(), ScrapedData.id.desc()),
+        )
+        .label("rank")
+    )
+    ranked = select(*ScrapedData.__table__.c, rank).where(*criteria).subquery()
+    return select(ranked).where(ranked.c.rank == 1).subquery("latest")
+
+
+def load_page_states(db: DatabaseConnector, url: str) -> dict[str, PageState]:
+    """Load the latest stored state of every page on a URL's domain.
+
+    Rows are selected through one range of the ``source_reverse`` index,
+    which covers the domain without its ``www.`` prefix and all of its
+    subdomains, so pages stored under ``www.example.com`` are found when
+    crawling ``example.com`` and the other way round. Rows are ranked in the
+    database so a single row per page is returned.
+
+    Parameters
+    ----------
+    db : DatabaseConnector
+        Connector with an active session
+    url : str
+        Any URL on the domain to look up
+
+    Returns
+    -------
+    dict[str, PageState]
+        Latest state per source URL
+
+    """
+    netloc = urlparse(url).netloc.lower()
+    domain = netloc[len("www.") :] if netloc.startswith("www.") else netloc
+    latest = latest_rows(domain_clause(domain))
+    statement = select(
+        latest.c.source, latest.c.content_hash, latest.c.last_modified, latest.c.etag
+    )
+    return {
+        source: PageState(
+            content_hash=content_hash, last_modified=last_modified, etag=etag
+        )
+        for source, content_hash, last_modified, etag in db.session.execute(statement)
+    }
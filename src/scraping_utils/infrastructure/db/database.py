@@ -1,25 +1,90 @@
 """Database connector."""
 
+import os
+import threading
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.orm import sessionmaker
+from ...core.settings import DatabaseConfig
+from .migrations import upgrade_scraped_data
 from .models import Base
+from .partitions import create_partitioned_table
+from .search_index import create_search_index
+
+_engines: dict[str, Engine] = {}
+_engines_pid = os.getpid()
+_engines_lock = threading.Lock()
+
+
+def get_engine(config: DatabaseConfig) -> Engine:
+    """Get the process-wide engine for a database URL, creating it on first use.
+
+    Engines are pooled and shared by every connector using the same URL, so
+    connections stay warm between sessions. The pool options of the first
+    config seen for a URL win. After a fork the child starts with a fresh
+    registry and never touches the parent's connections.
+
+    Parameters
+    ----------
+    config : DatabaseConfig
+        Database URL and pool options
+
+    Returns
+    -------
+    Engine
+        Shared SQLAlchemy engine
+
+    """
+    global _engines_pid
+
+    with _engines_lock:
+        if _engines_pid != os.getpid():
+            for engine in _engines.values():
+                engine.dispose(close=False)
+            _engines.clear()
+            _engines_pid = os.getpid()
+
+        engine = _engines.get(config.url)
+        if engine is None:
+            options: dict = {
+                "pool_pre_ping": config.pool_pre_ping,
+                "pool_recycle": config.pool_recycle,
+            }
+            # SQLite uses single-connection or null pools without these options
+            if make_url(config.url).get_backend_name() != "sqlite":
+                options["pool_size"] = config.pool_size
+                options["max_overflow"] = config.max_overflow
+            engine = create_engine(config.url, **options)
+            _engines[config.url] = engine
+        return engine
+
+
+def dispose_engines() -> None:
+    """Dispose every registered engine and close their pooled connections."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
 
 
 class DatabaseConnector:
     """Exposes database connection and session management."""
 
-    def __init__(self, database_url: str):
-        self._database_url = database_url
-        self._engine = None
+    def __init__(self, database: str | DatabaseConfig):
+        self._config = (
+            database
+            if isinstance(database, DatabaseConfig)
+            else DatabaseConfig(url=database)
+        )
+        self._database_url = self._config.url
         self._session_factory = None
         self._active_session = None
 
     @property
     def engine(self):
-        """Get the database engine."""
-        if self._engine is None:
-            self._engine = create_engine(self._database_url)
-        return self._engine
+        """Get the shared database engine for this connector's URL."""
+        return get_engine(self._config)
 
     @property
     def session_factory(self):
@@ -29,8 +94,20 @@ class DatabaseConnector:
         return self._session_factory
 
     def create_tables(self):
-        """Create all database tables."""
+        """Create all database tables, and the search index if enabled.
+
+        With partitioning enabled on PostgreSQL, ``scraped_data`` is created
+        partitioned by month along with its upcoming partitions. SQLite has
+        no partitioning and keeps a single table. An existing
+        ``scraped_data`` table gets the columns and indexes added to the
+        model since it was created.
+        """
+        if self._config.partitioned and self.engine.dialect.name == "postgresql":
+            create_partitioned_table(self.engine, self._config.partitions_ahead)
         Base.metadata.create_all(bind=self.engine)
+        upgrade_scraped_data(self.engine)
+        if self._config.full_text_search:
+            create_search_index(self.engine)
 
     def new_session(self):
         """Create a new database session."""
@@ -43,13 +120,15 @@ class DatabaseConnector:
             return self._active_session
         raise RuntimeError("No active session. Use within 'with' statement.")
 
+    def close(self):
+        """Close the active session, returning its connection to the pool."""
+        if self._active_session is not None:
+            self._active_session.close()
+            self._active_session = None
+
     def __enter__(self):
         self._active_session = self.new_session()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self._active_session is not None:
-            self._active_session.close()
-            self._active_session = None
-        if self._engine:
-            self._engine.dispose()
+        self.close()
@@ -0,0 +1,81 @@
+"""In-place upgrade of ``scraped_data`` tables created by earlier versions.
+
+``create_all`` only creates missing tables, so a table created before a
+column or index was added to the model keeps its old shape. Every column
+added since is nullable, so it can be added without rewriting rows.
+"""
+
+from logging import Logger, getLogger
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
+
+from .models.scraped_data import ScrapedData
+
+_logger: Logger = getLogger(__name__)
+
+# Indexes dropped from the model that only cost writes where they remain
+_OBSOLETE_INDEXES = ("idx_scraped_data_content_hash_source",)
+
+
+def upgrade_scraped_data(engine: Engine) -> list[str]:
+    """Add the model's columns and indexes missing from ``scraped_data``.
+
+    Existing rows get NULL in the new columns: their content hash,
+    fingerprint and blob key are left unset. Indexes whose columns differ
+    from the model's are rebuilt, and indexes the model no longer declares
+    are dropped. Does nothing if the table does not exist.
+
+    Parameters
+    ----------
+    engine : Engine
+        Engine of the database to upgrade
+
+    Returns
+    -------
+    list[str]
+        Names of the columns and indexes added, rebuilt or dropped
+
+    """
+    inspector = inspect(engine)
+    table = ScrapedData.__table__
+    if not inspector.has_table(table.name):
+        return []
+    columns = {column["name"] for column in inspector.get_columns(table.name)}
+    indexes = {
+        index["name"]: index["column_names"]
+        for index in inspector.get_indexes(table.name)
+    }
+
+    changed: list[str] = []
+    with engine.begin() as connection:
+        for column in table.columns:
+            if column.name in columns:
+                continue
+            if not column.nullable:
+                raise RuntimeError(
+                    f"Cannot add non-nullable column {column.name} to {table.name}"
+                )
+            column_type = column.type.compile(dialect=engine.dialect)
+            connection.execute(
+                text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+            )
+            changed.append(column.name)
+        for index in table.indexes:
+            columns_now = indexes.get(index.name)
+            if columns_now == [column.name for column in index.columns]:
+                continue
+            if columns_now is not None:
+                # Same name, older definition, e.g. the single-column
+                # idx_scraped_data_source_reverse that keyset paging can't use
+                connection.execute(text(f"DROP INDEX {index.name}"))
+            index.create(bind=connection)
+            changed.append(index.name)
+        for name in _OBSOLETE_INDEXES:
+            if name in indexes:
+                connection.execute(text(f"DROP INDEX {name}"))
+                changed.append(name)
+
+    if changed:
+        _logger.info(f"Upgraded {table.name}: changed {', '.join(changed)}")
+    return changed
@@ -1,5 +1,5 @@
 """Database models for the extraction library."""
 
-from .scraped_data import ScrapedData, Base
+from .scraped_data import ScrapedData, Base, reverse_domain
 
-__all__ = ["ScrapedData", "Base"]
+__all__ = ["ScrapedData", "Base", "reverse_domain"]
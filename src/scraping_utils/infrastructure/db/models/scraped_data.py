@@ -1,12 +1,19 @@
 """SQLAlchemy models for web scraping data."""
 
 import uuid
-from sqlalchemy import Column, String, Text, DateTime, Index
+from functools import lru_cache
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+
+from sqlalchemy import BigInteger, Column, String, Text, DateTime, Index
 from sqlalchemy.dialects.postgresql import UUID as PostgreSQLUUID
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.sql import func
 from sqlalchemy.types import TypeDecorator, CHAR
 
+if TYPE_CHECKING:
+    from ...storage.blob_store import BlobStore
+
 
 class GUID(TypeDecorator):
     """Cross-database UUID type for SQLAlchemy 1.4.
@@ -44,6 +51,40 @@ class GUID(TypeDecorator):
 Base = declarative_base()
 
 
+@lru_cache(maxsize=4096)
+def _reverse_netloc(netloc: str) -> str:
+    domain = netloc.lower()
+
+    # Remove port if present (e.g., example.com:8080 -> example.com)
+    if ":" in domain:
+        domain = domain.split(":")[0]
+
+    # Split domain parts and reverse them
+    domain_parts = domain.split(".")
+    return ".".join(reversed(domain_parts))
+
+
+def reverse_domain(url: str) -> str:
+    """Return the domain of a URL with its labels reversed.
+
+    For example, ``https://www.example.com/path`` becomes ``com.example.www``.
+    Results are cached per host, so reversing many URLs of the same site is
+    cheap.
+
+    Parameters
+    ----------
+    url : str
+        URL to extract the domain from
+
+    Returns
+    -------
+    str
+        Reversed domain
+
+    """
+    return _reverse_netloc(urlparse(url).netloc)
+
+
 class ScrapedData(Base):
     """Model for storing scraped web data.
 
@@ -68,8 +109,10 @@ class ScrapedData(Base):
         String(2048), nullable=False, comment="Source URL of the scraped content"
     )
 
+    # Bytewise collation on PostgreSQL keeps each domain's subdomains in one
+    # contiguous index range, as they already are on SQLite
     source_reverse = Column(
-        String(2048),
+        String(2048).with_variant(String(2048, collation="C"), "postgresql"),
         nullable=True,
         comment="Reversed source URL for better search performance on domain queries",
     )
@@ -78,6 +121,40 @@ class ScrapedData(Base):
         Text, nullable=True, comment="Extracted text content from the web page"
     )
 
+    text_blob = Column(
+        String(64),
+        nullable=True,
+        comment="Blob store key of the extracted text when stored out of line",
+    )
+
+    content_hash = Column(
+        String(64),
+        nullable=True,
+        comment="Hash of the page content, used to detect unchanged pages",
+    )
+
+    simhash = Column(
+        BigInteger,
+        nullable=True,
+        comment="64-bit SimHash of the extracted text, stored signed",
+    )
+
+    duplicate_of = Column(
+        GUID(),
+        nullable=True,
+        comment="Record this page nearly duplicates, when flagged at ingestion",
+    )
+
+    last_modified = Column(
+        DateTime(timezone=True),
+        nullable=True,
+        comment="Last modification date reported by the page, if any",
+    )
+
+    etag = Column(
+        String(256), nullable=True, comment="HTTP ETag reported by the page, if any"
+    )
+
     insertion_date = Column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -88,7 +165,12 @@ class ScrapedData(Base):
     # Indexes for better performance
     __table_args__ = (
         Index("idx_scraped_data_source", "source"),
-        Index("idx_scraped_data_source_reverse", "source_reverse"),
+        Index(
+            "idx_scraped_data_source_reverse",
+            "source_reverse",
+            "insertion_date",
+            "id",
+        ),
         Index("idx_scraped_data_insertion_date", "insertion_date"),
     )
 
@@ -106,23 +188,30 @@ class ScrapedData(Base):
             The source URL to set
 
         """
-        from urllib.parse import urlparse
-
         self.source = url
+        self.source_reverse = reverse_domain(url)
 
-        # Parse URL to extract domain
-        parsed = urlparse(url)
-        domain = parsed.netloc.lower()
+    def load_text(self, blob_store: "BlobStore | None" = None) -> str | None:
+        """Return the extracted text, reading it from the blob store if needed.
 
-        # Remove port if present (e.g., example.com:8080 -> example.com)
-        if ":" in domain:
-            domain = domain.split(":")[0]
+        Parameters
+        ----------
+        blob_store : BlobStore or None, default None
+            Store holding out-of-line bodies
 
-        # Split domain parts and reverse them
-        domain_parts = domain.split(".")
-        reversed_domain = ".".join(reversed(domain_parts))
+        Returns
+        -------
+        str or None
+            The extracted text
 
-        self.source_reverse = reversed_domain
+        """
+        if self.text_blob is None:
+            return self.extracted_text
+        if blob_store is None:
+            raise ValueError(
+                f"Text of record {self.id} is in the blob store, pass blob_store"
+            )
+        return blob_store.get_text(self.text_blob)
 
     def __repr__(self) -> str:
         return f"<ScrapedData(id={self.id}, source='{self.source[:50]}...', insertion_date={self.insertion_date})>"
@@ -0,0 +1,117 @@
+"""Detection of stored pages nearly identical to new ones."""
+
+import threading
+from collections.abc import Hashable, Iterable
+from itertools import batched
+from typing import Any, Literal
+
+from sqlalchemy import select
+
+from ...core.fingerprint import SimHashIndex, to_unsigned
+from .database import DatabaseConnector
+from .models.scraped_data import ScrapedData
+
+NearDuplicates = Literal["flag", "skip"]
+
+
+class NearDuplicateFilter:
+    """Match new rows against stored versions of the same page by SimHash.
+
+    Only versions of the same source URL are compared, so a listing page
+    whose new copy differs in timestamps or ad slots is caught, while
+    distinct pages of a site sharing a template are never taken for one
+    another. The fingerprints of the pages in a batch are loaded from
+    ``scraped_data`` in one query the first time each page is seen, into a
+    ``SimHashIndex`` per page kept for the rest of the run. Rows without a
+    near-duplicate are added to their page's index through ``add`` once
+    their batch is committed, so a batch that fails leaves no trace. Copies
+    repeated inside one batch are matched against each other. Safe to share
+    between writer threads.
+
+    Stored rows with a NULL ``simhash``, ingested before the column existed
+    or without near-duplicate detection, are never matched: there is no
+    backfill, so only pages ingested in these modes take part.
+
+    Parameters
+    ----------
+    mode : {"flag", "skip"}
+        ``"flag"`` stores near-duplicates with ``duplicate_of`` pointing at
+        the matched record, ``"skip"`` leaves them out
+    max_distance : int, default 3
+        Largest Hamming distance between 64-bit fingerprints still counted
+        as a near-duplicate
+
+    """
+
+    def __init__(self, mode: NearDuplicates, max_distance: int = 3):
+        if mode not in ("flag", "skip"):
+            raise ValueError(f"Unsupported near-duplicate mode: {mode}")
+        self.mode = mode
+        self.max_distance = max_distance
+        self._indexes: dict[str, SimHashIndex] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, db: DatabaseConnector, sources: Iterable[str]) -> None:
+        missing = {source for source in sources if source not in self._indexes}
+        if not missing:
+            return
+        loaded = {source: SimHashIndex(self.max_distance) for source in missing}
+        for chunk in batched(missing, 500):
+            statement = select(
+                ScrapedData.source, ScrapedData.id, ScrapedData.simhash
+            ).where(
+                ScrapedData.source.in_(chunk),
+                ScrapedData.simhash.is_not(None),
+                ScrapedData.duplicate_of.is_(None),
+            )
+            for source, record_id, fingerprint in db.session.execute(statement):
+                loaded[source].add(record_id, to_unsigned(fingerprint))
+        # Only mark the sources loaded once every query has succeeded
+        self._indexes.update(loaded)
+
+    def match(
+        self, db: DatabaseConnector, rows: list[dict[str, Any]]
+    ) -> list[Hashable | None]:
+        """Return, for each row, the id of the stored version it nearly duplicates.
+
+        Rows need ``id``, ``source`` and ``simhash`` keys. Rows without a
+        match are compared with the rows after them in the same batch, but
+        only indexed for later batches once passed to ``add``.
+        """
+        matches: list[Hashable | None] = []
+        pending: dict[str, SimHashIndex] = {}
+        with self._lock:
+            self._load(
+                db, (row["source"] for row in rows if row["simhash"] is not None)
+            )
+            for row in rows:
+                if row["simhash"] is None:
+                    matches.append(None)
+                    continue
+                fingerprint = to_unsigned(row["simhash"])
+                batch = pending.setdefault(
+                    row["source"], SimHashIndex(self.max_distance)
+                )
+                found = self._indexes[row["source"]].find(fingerprint)
+                if found is None:
+                    found = batch.find(fingerprint)
+                if found is None:
+                    batch.add(row["id"], fingerprint)
+                    matches.append(None)
+                else:
+                    matches.append(found[0])
+        return matches
+
+    def add(self, rows: Iterable[dict[str, Any]]) -> None:
+        """Index committed rows that were not flagged as near-duplicates.
+
+        Call after the batch passed to ``match`` is committed, with the rows
+        that were stored.
+        """
+        with self._lock:
+            for row in rows:
+                if row["simhash"] is None or row.get("duplicate_of") is not None:
+                    continue
+                index = self._indexes.get(row["source"])
+                if index is not None:
+                    index.add(row["id"], to_unsigned(row["simhash"]))
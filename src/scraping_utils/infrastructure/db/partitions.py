@@ -0,0 +1,152 @@
+"""Monthly range partitioning of ``scraped_data`` on PostgreSQL.
+
+With partitioning enabled the table is created ``PARTITION BY RANGE
+(insertion_date)`` with one child table per calendar month, named
+``scraped_data_pYYYYMM``, and a default partition catching rows outside
+them. Inserts go to the current month's small partition and its indexes,
+queries bounded by ``insertion_date`` only scan the matching months, and
+old months are dropped whole by the retention job instead of row by row.
+"""
+
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from sqlalchemy import MetaData, PrimaryKeyConstraint, Table, inspect, text
+from sqlalchemy.engine import Connection, Engine
+
+from .models.scraped_data import ScrapedData
+
+PARTITION_PREFIX = "scraped_data_p"
+DEFAULT_PARTITION = "scraped_data_default"
+
+
+def month_start(value: datetime) -> datetime:
+    """First instant of the month holding ``value``."""
+    return value.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    """Shift the first day of a month by a number of months."""
+    index = value.year * 12 + value.month - 1 + months
+    return value.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the partition holding a month, e.g. ``scraped_data_p202501``."""
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+@lru_cache(maxsize=1)
+def partitioned_table() -> Table:
+    """Copy of the ``scraped_data`` table declared as range partitioned.
+
+    PostgreSQL requires the partition key in every unique constraint, so the
+    copy's primary key is ``(id, insertion_date)``; ids stay unique as they
+    are random UUIDs, and the ORM keeps addressing rows by ``id`` alone.
+    """
+    table = ScrapedData.__table__.to_metadata(MetaData())
+    table.c.insertion_date.primary_key = True
+    table.append_constraint(PrimaryKeyConstraint(table.c.id, table.c.insertion_date))
+    table.dialect_options["postgresql"]["partition_by"] = "RANGE (insertion_date)"
+    return table
+
+
+def is_partitioned(connection: Connection) -> bool:
+    """Tell whether ``scraped_data`` is a partitioned PostgreSQL table."""
+    if connection.dialect.name != "postgresql":
+        return False
+    statement = text(
+        "SELECT 1 FROM pg_partitioned_table p JOIN pg_class c ON c.oid = p.partrelid "
+        "WHERE c.oid = to_regclass('scraped_data')"
+    )
+    return connection.execute(statement).first() is not None
+
+
+def create_partitioned_table(engine: Engine, months_ahead: int = 3) -> None:
+    """Create ``scraped_data`` as a partitioned table if it does not exist.
+
+    Also creates the default partition and the partitions from the current
+    month to ``months_ahead`` months later. An existing unpartitioned table
+    is left as is.
+    """
+    if engine.dialect.name != "postgresql":
+        raise NotImplementedError(
+            f"Native partitioning is not supported on {engine.dialect.name}"
+        )
+    if not inspect(engine).has_table(ScrapedData.__tablename__):
+        partitioned_table().create(bind=engine)
+    with engine.connect() as connection:
+        partitioned = is_partitioned(connection)
+    if partitioned:
+        ensure_partitions(engine, months_ahead=months_ahead)
+
+
+def ensure_partitions(
+    engine: Engine, start: datetime | None = None, months_ahead: int = 3
+) -> list[str]:
+    """Create any missing monthly partitions, and the default partition.
+
+    Run it ahead of time, e.g. daily: a month's partition cannot be created
+    once rows for that month have landed in the default partition.
+
+    Parameters
+    ----------
+    engine : Engine
+        PostgreSQL engine
+    start : datetime or None, default None
+        First month to cover, the current month when None
+    months_ahead : int, default 3
+        Months after the current one to cover
+
+    Returns
+    -------
+    list[str]
+        Names of the partitions covered
+
+    """
+    now = datetime.now(timezone.utc)
+    if start is None:
+        start = now
+    elif start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    month = month_start(start.astimezone(timezone.utc))
+    last = add_months(month_start(now), months_ahead)
+    names: list[str] = []
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} "
+                "PARTITION OF scraped_data DEFAULT"
+            )
+        )
+        while month <= last:
+            upper = add_months(month, 1)
+            name = partition_name(month)
+            connection.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF scraped_data "
+                    f"FOR VALUES FROM ('{month:%Y-%m-%d} 00:00+00') "
+                    f"TO ('{upper:%Y-%m-%d} 00:00+00')"
+                )
+            )
+            names.append(name)
+            month = upper
+    return names
+
+
+def list_partitions(connection: Connection) -> list[str]:
+    """Names of the monthly partitions of ``scraped_data``, oldest first."""
+    rows = connection.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = 'scraped_data'::regclass"
+        )
+    )
+    return sorted(name for (name,) in rows if name.startswith(PARTITION_PREFIX))
+
+
+def drop_partition(connection: Connection, name: str) -> None:
+    """Detach a partition from ``scraped_data`` and drop it."""
+    connection.execute(text(f"ALTER TABLE scraped_data DETACH PARTITION {name}"))
+    connection.execute(text(f"DROP TABLE {name}"))
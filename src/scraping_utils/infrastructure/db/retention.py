@@ -0,0 +1,279 @@
+"""Retention of ``scraped_data``: archive old months to Parquet, then drop them."""
+
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from itertools import batched
+from logging import Logger, getLogger
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy import and_, delete, exists, func, or_, select
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import ColumnElement
+
+from ...core.metrics import get_metrics
+from ..storage.blob_store import BlobStore
+from ..storage.parquet import ParquetBatchWriter, pyarrow
+from .database import DatabaseConnector
+from .models.scraped_data import ScrapedData
+from .partitions import (
+    add_months,
+    drop_partition,
+    is_partitioned,
+    list_partitions,
+    month_start,
+    partition_name,
+)
+from .search_index import search_index_exists, unindex
+
+_logger: Logger = getLogger(__name__)
+
+# Columns of archived and exported rows; URLs repeat a lot and are
+# dictionary-encoded
+ARCHIVE_DICTIONARY_COLUMNS = ("source", "source_reverse")
+
+
+def archive_schema() -> Any:
+    """Arrow schema of archived ``scraped_data`` rows."""
+    pa = pyarrow()
+    timestamp = pa.timestamp("us", tz="UTC")
+    return pa.schema(
+        [
+            ("id", pa.string()),
+            ("source", pa.string()),
+            ("source_reverse", pa.string()),
+            ("extracted_text", pa.large_string()),
+            ("text_blob", pa.string()),
+            ("content_hash", pa.string()),
+            ("simhash", pa.int64()),
+            ("duplicate_of", pa.string()),
+            ("last_modified", timestamp),
+            ("etag", pa.string()),
+            ("insertion_date", timestamp),
+        ]
+    )
+
+
+def _utc(value: datetime | None) -> datetime | None:
+    # SQLite returns naive datetimes, stored in UTC
+    if value is None or value.tzinfo is not None:
+        return value
+    return value.replace(tzinfo=timezone.utc)
+
+
+def archive_record(
+    row: ScrapedData, blob_store: BlobStore | None = None
+) -> dict[str, Any]:
+    """Convert a row to an archive record, inlining its text from the blob store."""
+    return {
+        "id": str(row.id),
+        "source": row.source,
+        "source_reverse": row.source_reverse,
+        "extracted_text": row.load_text(blob_store),
+        "text_blob": row.text_blob,
+        "content_hash": row.content_hash,
+        "simhash": row.simhash,
+        "duplicate_of": str(row.duplicate_of) if row.duplicate_of else None,
+        "last_modified": _utc(row.last_modified),
+        "etag": row.etag,
+        "insertion_date": _utc(row.insertion_date),
+    }
+
+
+def _superseded() -> ColumnElement[bool]:
+    """Condition on ``ScrapedData`` rows that a later row of their source replaces.
+
+    Rows are ordered as in ``latest_rows``: by ``insertion_date``, then ``id``.
+    """
+    newer = aliased(ScrapedData)
+    return exists().where(
+        newer.source == ScrapedData.source,
+        or_(
+            newer.insertion_date > ScrapedData.insertion_date,
+            and_(
+                newer.insertion_date == ScrapedData.insertion_date,
+                newer.id > ScrapedData.id,
+            ),
+        ),
+    )
+
+
+def _archive_path(archive_dir: str | Path, label: str) -> Path:
+    # Months keeping latest rows can be archived again by later runs
+    path = Path(archive_dir) / f"scraped_data_{label}.parquet"
+    if path.exists():
+        path = path.with_stem(f"{path.stem}_{datetime.now(timezone.utc):%Y%m%dT%H%M%S}")
+    return path
+
+
+def _month_rows(
+    db: DatabaseConnector, *criteria: ColumnElement[bool], batch_size: int
+) -> Iterator[ScrapedData]:
+    statement = (
+        select(ScrapedData)
+        .where(*criteria)
+        .order_by(ScrapedData.insertion_date, ScrapedData.id)
+        .execution_options(yield_per=batch_size)
+    )
+    for row in db.session.scalars(statement):
+        yield row
+        db.session.expunge(row)
+
+
+def _delete_unreferenced_blobs(
+    db: DatabaseConnector, blob_store: BlobStore, keys: Iterable[str]
+) -> int:
+    deleted = 0
+    for chunk in batched(keys, 500):
+        referenced = set(
+            db.session.scalars(
+                select(ScrapedData.text_blob)
+                .where(ScrapedData.text_blob.in_(chunk))
+                .distinct()
+            )
+        )
+        for key in chunk:
+            if key not in referenced and blob_store.delete_idle(key):
+                deleted += 1
+    return deleted
+
+
+def apply_retention(
+    db: DatabaseConnector,
+    before: datetime,
+    archive_dir: str | Path | None = None,
+    blob_store: BlobStore | None = None,
+    batch_size: int = 10_000,
+    keep_latest: bool = True,
+) -> list[str]:
+    """Archive and remove every whole month of rows inserted before a date.
+
+    Months are processed oldest first, each on its own: its rows are
+    streamed to ``<archive_dir>/scraped_data_YYYY-MM.parquet`` (texts
+    included, even when kept in the blob store), then removed along with
+    their search index entries. On a partitioned PostgreSQL table the
+    month's partition is detached and dropped; elsewhere, including SQLite,
+    the month is deleted as one ``insertion_date`` index range. SQLite is
+    deliberately not sharded into per-month tables or database files: the
+    range delete only touches the month's rows, and a single table keeps
+    dedupe, incremental crawls and domain queries on one index. Finally,
+    blobs no longer referenced by any row, and idle for the blob store's
+    grace period, are deleted.
+
+    With ``keep_latest``, the latest row of each page is kept whatever its
+    age: a page unchanged since an old month, and skipped by ingestion
+    dedupe since, still has its current state for dedupe and incremental
+    crawls. Months holding such rows are deleted row by row, their
+    partition is kept, and rows superseded later are archived by a later
+    run under a timestamped file name.
+
+    Parameters
+    ----------
+    db : DatabaseConnector
+        Connector with an active session
+    before : datetime
+        Cutoff; only months ending on or before its month start are removed.
+        Naive values are taken as UTC.
+    archive_dir : str, Path or None, default None
+        Directory of the Parquet archives; None removes without archiving
+    blob_store : BlobStore or None, default None
+        Store holding out-of-line texts, required when rows use it
+    batch_size : int, default 10_000
+        Rows per Parquet row group and per fetch
+    keep_latest : bool, default True
+        Keep the latest row of each source URL
+
+    Returns
+    -------
+    list[str]
+        Months rows were removed from, as ``YYYY-MM``
+
+    """
+    metrics = get_metrics()
+    if before.tzinfo is None:
+        before = before.replace(tzinfo=timezone.utc)
+    cutoff = month_start(before.astimezone(timezone.utc))
+
+    oldest = db.session.execute(
+        select(func.min(ScrapedData.insertion_date))
+    ).scalar_one()
+    if oldest is None:
+        return []
+    month = month_start(_utc(oldest).astimezone(timezone.utc))
+
+    connection = db.session.connection()
+    partitions = (
+        set(list_partitions(connection)) if is_partitioned(connection) else set()
+    )
+    indexed = search_index_exists(db.engine)
+
+    removed: list[str] = []
+    while month < cutoff:
+        end = add_months(month, 1)
+        label = f"{month:%Y-%m}"
+        in_month = (
+            ScrapedData.insertion_date >= month,
+            ScrapedData.insertion_date < end,
+        )
+
+        name = partition_name(month)
+        removable = (*in_month, _superseded()) if keep_latest else in_month
+        count = db.session.execute(
+            select(func.count()).select_from(ScrapedData).where(*removable)
+        ).scalar_one()
+        kept = (
+            db.session.execute(
+                select(func.count())
+                .select_from(ScrapedData)
+                .where(*in_month, ~_superseded())
+            ).scalar_one()
+            if keep_latest
+            else 0
+        )
+        droppable = name in partitions and not kept
+        if not count and not droppable:
+            month = end
+            continue
+
+        if archive_dir is not None and count:
+            path = _archive_path(archive_dir, label)
+            with metrics.timer("retention_archive_seconds"):
+                with ParquetBatchWriter(
+                    path,
+                    archive_schema(),
+                    batch_size=batch_size,
+                    dictionary_columns=ARCHIVE_DICTIONARY_COLUMNS,
+                ) as writer:
+                    for row in _month_rows(db, *removable, batch_size=batch_size):
+                        writer.write(archive_record(row, blob_store))
+            metrics.counter("retention_archived_rows", writer.rows_written)
+            _logger.info(f"Archived {writer.rows_written} rows of {label} to {path}")
+
+        blobs = set(
+            db.session.scalars(
+                select(ScrapedData.text_blob)
+                .where(*removable, ScrapedData.text_blob.is_not(None))
+                .distinct()
+            )
+        )
+        if indexed:
+            unindex(db, select(ScrapedData.id).where(*removable))
+        if droppable:
+            drop_partition(db.session.connection(), name)
+        else:
+            db.session.execute(
+                delete(ScrapedData)
+                .where(*removable)
+                .execution_options(synchronize_session=False)
+            )
+        db.session.commit()
+
+        if blobs and blob_store is not None:
+            deleted = _delete_unreferenced_blobs(db, blob_store, blobs)
+            metrics.counter("retention_deleted_blobs", deleted)
+        removed.append(label)
+        _logger.info(
+            f"Removed {count} rows of {label} from scraped_data, kept {kept} latest"
+        )
+        month = end
+    return removed
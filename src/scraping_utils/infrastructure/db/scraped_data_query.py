@@ -0,0 +1,231 @@
+"""Read-side queries over scraped data by domain."""
+
+import uuid
+from collections.abc import Iterator
+from datetime import datetime
+from urllib.parse import urlparse
+
+from sqlalchemy import and_, bindparam, func, or_, select, tuple_
+from sqlalchemy.sql import ColumnElement, Select
+
+from .database import DatabaseConnector
+from .models.scraped_data import ScrapedData, _reverse_netloc
+from .search_index import search_statement
+
+# Position after the last row returned: (source_reverse, insertion_date, id)
+Cursor = tuple[str, datetime, uuid.UUID]
+
+
+def domain_clause(domain: str, include_subdomains: bool = True) -> ColumnElement:
+    """Match rows of a domain, and optionally its subdomains, on ``source_reverse``.
+
+    Parameters
+    ----------
+    domain : str
+        Domain such as ``solotodo.cl``; a URL is also accepted
+    include_subdomains : bool, default True
+        Also match subdomains such as ``www.solotodo.cl``
+
+    Returns
+    -------
+    ColumnElement
+        Condition served by a single range of the ``source_reverse`` index
+
+    """
+    netloc = urlparse(domain).netloc if "//" in domain else domain
+    reversed_domain = _reverse_netloc(netloc.strip("."))
+    exact = ScrapedData.source_reverse == reversed_domain
+    if not include_subdomains:
+        return exact
+    # One index range holds the domain and everything under it, since "/"
+    # sorts right after "."; the second test drops siblings such as
+    # "cl.solotodo-shop" that fall inside the range
+    return and_(
+        ScrapedData.source_reverse >= reversed_domain,
+        ScrapedData.source_reverse < reversed_domain + "/",
+        or_(exact, ScrapedData.source_reverse >= reversed_domain + "."),
+    )
+
+
+class ScrapedDataQuery:
+    """Query stored pages by domain with time windows and keyset pagination.
+
+    Domains are matched on ``source_reverse``, where a domain and all of its
+    subdomains (``cl.solotodo`` and ``cl.solotodo.*``) form one contiguous
+    key range of ``idx_scraped_data_source_reverse``. Rows come back in that
+    index's order, ``(source_reverse, insertion_date, id)``, and each page
+    seeks past the last row of the previous one instead of using OFFSET, so
+    every page costs the same however deep the scan goes.
+
+    Parameters
+    ----------
+    db : DatabaseConnector
+        Connector with an active session
+    language : str, default "simple"
+        PostgreSQL text search configuration used by ``search``; must match
+        the one the index was built with
+
+    """
+
+    def __init__(self, db: DatabaseConnector, language: str = "simple"):
+        self.db = db
+        self.language = language
+
+    def _select(
+        self,
+        statement: Select,
+        domain: str | None,
+        include_subdomains: bool,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> Select:
+        if domain is not None:
+            statement = statement.where(domain_clause(domain, include_subdomains))
+        if since is not None:
+            statement = statement.where(ScrapedData.insertion_date >= since)
+        if until is not None:
+            statement = statement.where(ScrapedData.insertion_date < until)
+        return statement
+
+    def page(
+        self,
+        domain: str | None,
+        include_subdomains: bool = True,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        after: Cursor | None = None,
+        limit: int = 1000,
+    ) -> tuple[list[ScrapedData], Cursor | None]:
+        """Fetch one page of a domain's rows.
+
+        Parameters
+        ----------
+        domain : str or None
+            Domain to look up, e.g. ``solotodo.cl``; a URL is also accepted.
+            None pages through every domain in the same order, leaving out
+            rows without a ``source_reverse``.
+        include_subdomains : bool, default True
+            Also match subdomains such as ``www.solotodo.cl``
+        since : datetime or None, default None
+            Only rows inserted at or after this time
+        until : datetime or None, default None
+            Only rows inserted before this time
+        after : Cursor or None, default None
+            Cursor returned with the previous page
+        limit : int, default 1000
+            Maximum rows per page
+
+        Returns
+        -------
+        tuple[list[ScrapedData], Cursor or None]
+            The rows and the cursor of the next page, None after the last one
+
+        """
+        statement = self._select(
+            select(ScrapedData), domain, include_subdomains, since, until
+        )
+        # A NULL key never compares greater than a cursor, so such rows
+        # could only show up on the first page; leave them out of every page
+        statement = statement.where(ScrapedData.source_reverse.is_not(None))
+        key = (ScrapedData.source_reverse, ScrapedData.insertion_date, ScrapedData.id)
+        if after is not None:
+            bounds = (
+                bindparam(None, value, type_=column.type)
+                for column, value in zip(key, after)
+            )
+            statement = statement.where(tuple_(*key) > tuple_(*bounds))
+        statement = statement.order_by(*key).limit(limit)
+
+        rows = list(self.db.session.scalars(statement))
+        if len(rows) < limit:
+            return rows, None
+        last = rows[-1]
+        return rows, (last.source_reverse, last.insertion_date, last.id)
+
+    def iter_domain(
+        self,
+        domain: str | None,
+        include_subdomains: bool = True,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        batch_size: int = 1000,
+    ) -> Iterator[ScrapedData]:
+        """Yield every row of a domain, fetching ``batch_size`` rows at a time.
+
+        Rows are expunged from the session once yielded, so memory stays
+        bounded however many rows the domain holds.
+        """
+        cursor: Cursor | None = None
+        while True:
+            rows, cursor = self.page(
+                domain, include_subdomains, since, until, cursor, batch_size
+            )
+            for row in rows:
+                yield row
+                self.db.session.expunge(row)
+            if cursor is None:
+                return
+
+    def count(
+        self,
+        domain: str,
+        include_subdomains: bool = True,
+        since: datetime | None = None,
+        until: datetime | None = None,
+    ) -> int:
+        """Count a domain's rows."""
+        statement = self._select(
+            select(func.count()).select_from(ScrapedData),
+            domain,
+            include_subdomains,
+            since,
+            until,
+        )
+        return self.db.session.execute(statement).scalar_one()
+
+    def search(
+        self,
+        query: str,
+        domain: str | None = None,
+        include_subdomains: bool = True,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int = 50,
+    ) -> list[tuple[ScrapedData, float]]:
+        """Search extracted texts, best match first.
+
+        Uses the full-text index built during ingestion when
+        ``DB__FULL_TEXT_SEARCH`` is enabled: a GIN-indexed ``tsvector`` on
+        PostgreSQL, FTS5 on SQLite.
+
+        Parameters
+        ----------
+        query : str
+            Words, ``"quoted phrases"`` and ``OR``; all other terms must match
+        domain : str or None, default None
+            Restrict results to a domain, see ``page``
+        include_subdomains : bool, default True
+            Also match subdomains of ``domain``
+        since : datetime or None, default None
+            Only rows inserted at or after this time
+        until : datetime or None, default None
+            Only rows inserted before this time
+        limit : int, default 50
+            Maximum number of results
+
+        Returns
+        -------
+        list[tuple[ScrapedData, float]]
+            Matching rows with their rank, higher ranks matching better
+
+        """
+        if not query.strip():
+            return []
+        statement = self._select(
+            search_statement(self.db, query, self.language),
+            domain,
+            include_subdomains,
+            since,
+            until,
+        ).limit(limit)
+        return [(row, rank) for row, rank in self.db.session.execute(statement)]
@@ -0,0 +1,171 @@
+"""Full-text search index over extracted texts.
+
+PostgreSQL keeps a ``tsvector`` per record in ``scraped_data_search`` under a
+GIN index; SQLite keeps an FTS5 table, ``scraped_data_fts``. Both are
+written alongside ``scraped_data`` during ingestion, from the text at hand,
+so they also cover texts stored out of line in the blob store.
+"""
+
+import re
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import (
+    Column,
+    Index,
+    MetaData,
+    Table,
+    Text,
+    bindparam,
+    delete,
+    func,
+    insert,
+    inspect,
+    literal_column,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import ColumnElement, Select, column, table
+
+from .models.scraped_data import GUID, ScrapedData
+
+if TYPE_CHECKING:
+    from .database import DatabaseConnector
+
+# Kept out of Base.metadata: the table only exists on PostgreSQL
+_metadata = MetaData()
+
+search_table = Table(
+    "scraped_data_search",
+    _metadata,
+    Column("id", GUID(), primary_key=True),
+    Column("document", TSVECTOR, nullable=False),
+    Index("idx_scraped_data_search_document", "document", postgresql_using="gin"),
+)
+
+_FTS_TABLE = "scraped_data_fts"
+fts_table = table(_FTS_TABLE, column("body"), column("record_id"))
+
+_QUERY_TERMS = re.compile(r'"([^"]*)"?|(\S+)')
+
+
+def fts5_query(query: str) -> str:
+    """Translate web search syntax into an FTS5 query.
+
+    Every word and ``"quoted phrase"`` becomes an FTS5 string, so punctuation
+    in the input can never be read as query syntax; ``OR`` is kept as the
+    operator and all other terms must match.
+    """
+    terms: list[str] = []
+    for match in _QUERY_TERMS.finditer(query):
+        phrase, word = match.groups()
+        if word == "OR":
+            if terms and terms[-1] != "OR":
+                terms.append("OR")
+            continue
+        term = phrase if phrase is not None else word
+        # Terms without a word character hold no tokens and match nothing
+        if re.search(r"\w", term):
+            terms.append('"' + term.replace('"', '""') + '"')
+    while terms and terms[-1] == "OR":
+        terms.pop()
+    return " ".join(terms)
+
+
+def create_search_index(engine: Engine) -> None:
+    """Create the search index for the engine's dialect if it does not exist."""
+    dialect = engine.dialect.name
+    if dialect == "postgresql":
+        _metadata.create_all(bind=engine)
+    elif dialect == "sqlite":
+        with engine.begin() as connection:
+            connection.execute(
+                text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {_FTS_TABLE} USING fts5("
+                    "body, record_id UNINDEXED, "
+                    "tokenize = 'unicode61 remove_diacritics 2')"
+                )
+            )
+    else:
+        raise NotImplementedError(f"Full-text search is not supported on {dialect}")
+
+
+def search_index_exists(engine: Engine) -> bool:
+    """Tell whether the engine's database has a search index."""
+    name = search_table.name if engine.dialect.name == "postgresql" else _FTS_TABLE
+    return inspect(engine).has_table(name)
+
+
+def unindex(db: "DatabaseConnector", ids: Select) -> None:
+    """Remove the records selected by ``ids`` from the search index.
+
+    Runs in the session's transaction. ``ids`` selects ``ScrapedData.id``.
+    """
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(delete(search_table).where(search_table.c.id.in_(ids)))
+    else:
+        db.session.execute(delete(fts_table).where(fts_table.c.record_id.in_(ids)))
+
+
+def index_texts(
+    db: "DatabaseConnector", items: Iterable[tuple[Any, str | None]], language: str
+) -> None:
+    """Add records to the search index in the session's transaction.
+
+    Parameters
+    ----------
+    db : DatabaseConnector
+        Connector with an active session
+    items : Iterable[tuple[Any, str or None]]
+        Record id and extracted text pairs
+    language : str
+        PostgreSQL text search configuration, ignored on SQLite
+
+    """
+    rows = [{"id": record_id, "body": body or ""} for record_id, body in items]
+    if not rows:
+        return
+    if db.engine.dialect.name == "postgresql":
+        db.session.execute(
+            insert(search_table).values(
+                document=func.to_tsvector(language, bindparam("body", type_=Text))
+            ),
+            rows,
+        )
+    else:
+        db.session.execute(
+            text(f"INSERT INTO {_FTS_TABLE} (body, record_id) VALUES (:body, :id)"),
+            [{"body": row["body"], "id": str(row["id"])} for row in rows],
+        )
+
+
+def search_statement(
+    db: "DatabaseConnector", query: str, language: str, *where: ColumnElement
+) -> Select:
+    """Build a ranked search over ``scraped_data``.
+
+    Selects ``(ScrapedData, rank)`` pairs, best match first, where a higher
+    rank is a better match. ``query`` uses the web search syntax of each
+    engine: words, ``"quoted phrases"`` and ``OR``.
+    """
+    if db.engine.dialect.name == "postgresql":
+        tsquery = func.websearch_to_tsquery(language, query)
+        rank = func.ts_rank_cd(search_table.c.document, tsquery).label("rank")
+        statement = (
+            select(ScrapedData, rank)
+            .join(search_table, search_table.c.id == ScrapedData.id)
+            .where(search_table.c.document.op("@@")(tsquery))
+        )
+    else:
+        fts = literal_column(_FTS_TABLE)
+        # bm25() is lower for better matches
+        rank = (-func.bm25(fts)).label("rank")
+        statement = (
+            select(ScrapedData, rank)
+            .select_from(fts_table)
+            .join(ScrapedData, ScrapedData.id == fts_table.c.record_id)
+            .where(fts.op("MATCH")(fts5_query(query)))
+        )
+    return statement.where(*where).order_by(rank.desc())
@@ -6,7 +6,7 @@ database services following dependency injection principles.
 
 from typing import Generator
 from sqlalchemy.orm import Session
-from ...core.settings import Settings
+from ...core.settings import Settings, get_settings
 from .database import DatabaseConnector
 
 
@@ -54,7 +54,7 @@ def create_database_service(settings: Settings | None = None) -> DatabaseService
     Parameters
     ----------
     settings : Settings or None, default None
-        Optional settings instance. If None, creates a new Settings instance.
+        Optional settings instance. If None, uses ``get_settings()``.
 
     Returns
     -------
@@ -63,7 +63,7 @@ def create_database_service(settings: Settings | None = None) -> DatabaseService
 
     """
     if settings is None:
-        settings = Settings()
+        settings = get_settings()
 
     connector = DatabaseConnector(settings.db)
     return DatabaseService(connector)
@@ -75,7 +75,7 @@ def create_database_connector(settings: Settings | None = None) -> DatabaseConne
     Parameters
     ----------
     settings : Settings or None, default None
-        Optional settings instance. If None, creates a new Settings instance.
+        Optional settings instance. If None, uses ``get_settings()``.
 
     Returns
     -------
@@ -84,6 +84,6 @@ def create_database_connector(settings: Settings | None = None) -> DatabaseConne
 
     """
     if settings is None:
-        settings = Settings()
+        settings = get_settings()
 
     return DatabaseConnector(settings.db)
@@ -0,0 +1,201 @@
+"""Reading and writing of crawl artifact files.
+
+Crawl artifacts are sequences of JSON records stored either as a single JSON
+array (``json``) or as newline-delimited JSON (``ndjson``), optionally
+compressed with gzip or zstd. Readers detect the layout and compression from
+the file contents, so callers never need to know how a file was written.
+"""
+
+import gzip
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import IO, Any, Literal
+
+OutputFormat = Literal["json", "ndjson"]
+Compression = Literal["gzip", "zstd"]
+
+FORMAT_EXTENSIONS: dict[str, str] = {"json": ".json", "ndjson": ".ndjson"}
+COMPRESSION_EXTENSIONS: dict[str, str] = {"gzip": ".gz", "zstd": ".zst"}
+
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+_CHUNK_SIZE = 1 << 20
+
+
+def artifact_suffix(
+    output_format: OutputFormat = "json", compression: Compression | None = None
+) -> str:
+    """Return the file suffix for an artifact format, e.g. ``.ndjson.zst``."""
+    if output_format not in FORMAT_EXTENSIONS:
+        raise ValueError(f"Unsupported output format: {output_format}")
+    if compression is not None and compression not in COMPRESSION_EXTENSIONS:
+        raise ValueError(f"Unsupported compression: {compression}")
+    suffix = FORMAT_EXTENSIONS[output_format]
+    if compression is not None:
+        suffix += COMPRESSION_EXTENSIONS[compression]
+    return suffix
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "zstd compression requires the 'zstandard' package. "
+            "Install it with the 'zstd' extra."
+        ) from e
+    return zstandard
+
+
+def _detect_compression(path: Path) -> Compression | None:
+    with open(path, "rb") as f:
+        magic = f.read(4)
+    if magic.startswith(_GZIP_MAGIC):
+        return "gzip"
+    if magic.startswith(_ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+
+def open_artifact(
+    path: str | Path, mode: Literal["r", "w"], compression: Compression | None = None
+) -> IO[str]:
+    """Open an artifact file as a UTF-8 text stream.
+
+    Parameters
+    ----------
+    path : str or Path
+        Artifact file path
+    mode : {"r", "w"}
+        Open for reading or writing
+    compression : {"gzip", "zstd"} or None, default None
+        Compression used when writing. Ignored when reading, where it is
+        detected from the file's magic bytes.
+
+    Returns
+    -------
+    IO[str]
+        Text stream over the (de)compressed content
+
+    """
+    path = Path(path)
+    if mode == "r":
+        compression = _detect_compression(path)
+
+    if compression == "gzip":
+        return gzip.open(path, f"{mode}t", encoding="utf-8", compresslevel=6)
+    if compression == "zstd":
+        zstandard = _zstandard()
+        if mode == "w":
+            return zstandard.open(
+                path, "wt", cctx=zstandard.ZstdCompressor(level=3), encoding="utf-8"
+            )
+        return zstandard.open(path, "rt", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+class RecordWriter:
+    """Write JSON records to an artifact stream one at a time.
+
+    The ``json`` format produces the same indented array ``json.dump`` would,
+    while ``ndjson`` writes one compact record per line.
+    """
+
+    def __init__(self, stream: IO[str], output_format: OutputFormat = "json"):
+        if output_format not in FORMAT_EXTENSIONS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+        self._stream = stream
+        self._format = output_format
+        self.count = 0
+        if self._format == "json":
+            self._stream.write("[")
+
+    def encode(self, record: dict[str, Any]) -> str:
+        """Serialize a record to the text ``write_encoded`` appends."""
+        if self._format == "ndjson":
+            return json.dumps(record, ensure_ascii=False) + "\n"
+        item = json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n  ")
+        return ("\n  " if self.count == 0 else ",\n  ") + item
+
+    def write_encoded(self, text: str) -> None:
+        """Append a record previously serialized with ``encode``."""
+        self._stream.write(text)
+        self.count += 1
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Append a record to the artifact."""
+        self.write_encoded(self.encode(record))
+
+    def close(self) -> None:
+        """Terminate the artifact; the underlying stream is left open."""
+        if self._format == "json":
+            self._stream.write("\n]" if self.count else "]")
+
+
+def iter_records(path: str | Path) -> Iterator[dict[str, Any]]:
+    """Yield the JSON records of an artifact file incrementally.
+
+    Handles JSON arrays, newline-delimited JSON and single JSON objects, in
+    plain, gzip or zstd files. Only one record is decoded at a time.
+
+    Parameters
+    ----------
+    path : str or Path
+        Artifact file path
+
+    Yields
+    ------
+    dict[str, Any]
+        Decoded records, in file order
+
+    """
+    decoder = json.JSONDecoder()
+    with open_artifact(path, "r") as f:
+        buffer = ""
+        position = 0
+        eof = False
+        in_array: bool | None = None
+
+        while True:
+            # Skip whitespace and array punctuation between records
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position < len(buffer) and in_array is None:
+                in_array = buffer[position] == "["
+                if in_array:
+                    position += 1
+                continue
+            if in_array and position < len(buffer) and buffer[position] == "]":
+                return
+
+            if position >= len(buffer):
+                if eof:
+                    return
+                buffer = buffer[position:] + f.read(_CHUNK_SIZE)
+                position = 0
+                eof = position >= len(buffer)
+                continue
+
+            try:
+                record, end = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                chunk = f.read(_CHUNK_SIZE)
+                eof = not chunk
+                buffer = buffer[position:] + chunk
+                position = 0
+                continue
+
+            # A value ending exactly at the buffer edge may be truncated
+            if end == len(buffer) and not eof:
+                chunk = f.read(_CHUNK_SIZE)
+                if chunk:
+                    buffer = buffer[position:] + chunk
+                    position = 0
+                    continue
+                eof = True
+
+            yield record
+            position = end
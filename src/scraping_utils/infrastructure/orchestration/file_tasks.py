@@ -1,26 +1,367 @@
 """File processing tasks for Airflow."""
 
-import json
+import hashlib
 import logging
+import multiprocessing
+import os
+import threading
 import uuid
-from datetime import datetime
-from typing import Any
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from datetime import datetime, timezone
+from itertools import batched
+from queue import Empty, Queue
+from typing import Any, Literal
 
-from ...core.settings import Settings
+from sqlalchemy import insert, select, update
+
+from ...core.fingerprint import simhash, to_signed
+from ...core.metrics import get_metrics
+from ...core.settings import Settings, get_settings
 from ...domain.entities.website import WebsiteEntity
+from ...domain.entities.website_batch import WebsiteBatch
+from ..db.crawl_state import latest_rows
 from ..db.database import DatabaseConnector
-from ..db.models.scraped_data import ScrapedData
+from ..db.models.scraped_data import ScrapedData, reverse_domain
+from ..db.near_duplicates import NearDuplicateFilter, NearDuplicates
+from ..db.search_index import index_texts
+from ..storage.blob_store import BlobStore, get_blob_store
+from .artifacts import iter_records
 
 logger = logging.getLogger(__name__)
 
+Dedupe = Literal["skip", "update"]
+
+# Parsed batches a file may have waiting for its writer in parallel mode
+_QUEUED_BATCHES = 2
+
+# Entity fields never written to scraped_data, dropped before validation
+_UNSTORED_FIELDS = ("content_html", "links", "images", "description")
+
+
+def _extracted_text(
+    content_text: str | None, content_markdown: str | None, title: str | None
+) -> str:
+    return content_text or content_markdown or title or ""
+
+
+def _content_hash(content_hash: str | None, extracted_text: str) -> str:
+    """Return the stored content hash, hashing the extracted text if missing."""
+    if content_hash:
+        return content_hash
+    return hashlib.md5(extracted_text.encode("utf-8")).hexdigest()
+
+
+def _fingerprint(extracted_text: str) -> int | None:
+    """Return the text's SimHash as stored, None for a text without words."""
+    fingerprint = simhash(extracted_text)
+    return to_signed(fingerprint) if fingerprint else None
+
+
+def _latest_records(
+    db: DatabaseConnector, rows: list[dict[str, Any]]
+) -> dict[str, tuple[Any, str | None]]:
+    """Map the sources of ``rows`` already stored to their latest (id, content_hash).
+
+    Only the latest row of a source counts, so a page whose content went
+    back to an earlier version is stored again.
+    """
+    latest = latest_rows(ScrapedData.source.in_({row["source"] for row in rows}))
+    statement = select(latest.c.id, latest.c.source, latest.c.content_hash)
+    return {
+        source: (record_id, content_hash)
+        for record_id, source, content_hash in db.session.execute(statement)
+    }
+
+
+def _to_rows(
+    items: Iterable[dict[str, Any]], fingerprint: bool = False
+) -> list[dict[str, Any]]:
+    """Validate raw records and convert them to ``scraped_data`` rows.
+
+    Records are loaded into a ``WebsiteBatch`` and only the fields stored in
+    ``scraped_data`` are validated, column by column. SimHash fingerprints
+    cost milliseconds per page, so ``simhash`` is only computed with
+    ``fingerprint`` set and left None otherwise.
+    """
+    with get_metrics().timer("ingest_validate_seconds"):
+        batch = WebsiteBatch.from_records(items, exclude=_UNSTORED_FIELDS)
+        sources = batch.column("url")
+        extracted_texts = [
+            _extracted_text(*values)
+            for values in zip(
+                batch.column("content_text"),
+                batch.column("content_markdown"),
+                batch.column("title"),
+            )
+        ]
+        content_hashes = batch.column("content_hash")
+        last_modified = batch.column("last_modified")
+        metadata = batch.column("metadata")
+    return [
+        {
+            "id": uuid.uuid4(),
+            "source": source,
+            "source_reverse": reverse_domain(source),
+            "extracted_text": extracted_text,
+            "content_hash": _content_hash(content_hash, extracted_text),
+            "simhash": _fingerprint(extracted_text) if fingerprint else None,
+            "last_modified": modified,
+            "etag": meta.get("etag"),
+        }
+        for source, extracted_text, content_hash, modified, meta in zip(
+            sources, extracted_texts, content_hashes, last_modified, metadata
+        )
+    ]
+
+
+def _parse_batches(
+    file_path: str, batch_size: int, queue: "Queue[Any]", fingerprint: bool
+) -> None:
+    """Read, validate and convert an artifact file, putting rows on ``queue``.
+
+    Each batch of ``batch_size`` rows is put on the queue as soon as it is
+    ready, followed by None once the file is done or has failed. A bounded
+    queue makes the parser wait for the writer, so a file is never held in
+    memory whole.
+    """
+    try:
+        records = get_metrics().timed(iter_records(file_path), "ingest_parse_seconds")
+        for batch in batched(records, batch_size):
+            queue.put(_to_rows(batch, fingerprint))
+    finally:
+        queue.put(None)
+
+
+class _DomainLocks:
+    """Locks serializing deduplicated writes per source domain.
+
+    Deduplication looks up stored rows, then inserts the new ones; two
+    writers doing this for the same domain at once would both miss the
+    other's rows. Holding the domain's lock from the lookup to the commit
+    prevents that between the writer threads of one process.
+    """
+
+    def __init__(self):
+        self._locks: defaultdict[str, threading.Lock] = defaultdict(threading.Lock)
+        self._guard = threading.Lock()
+
+    @contextmanager
+    def hold(self, domains: Iterable[str]) -> Iterator[None]:
+        """Hold the locks of several domains, always taken in the same order."""
+        with self._guard:
+            locks = [self._locks[domain] for domain in sorted(set(domains))]
+        with ExitStack() as stack:
+            for lock in locks:
+                stack.enter_context(lock)
+            yield
+
+
+def _write_batch(
+    db: DatabaseConnector,
+    rows: list[dict[str, Any]],
+    dedupe: Dedupe | None = None,
+    blob_store: BlobStore | None = None,
+    search_language: str | None = None,
+    near_duplicates: NearDuplicateFilter | None = None,
+    domain_locks: _DomainLocks | None = None,
+) -> tuple[int, int]:
+    """Insert one batch of rows with a Core ``insert()`` executemany and commit.
+
+    On PostgreSQL the psycopg2 dialect turns the executemany into
+    ``execute_values`` pages, so each batch is a handful of round trips. With
+    a blob store, texts are stored there and rows only keep their key. With
+    a ``search_language``, the texts are added to the full-text index in the
+    same transaction. With ``domain_locks``, deduplicated batches hold the
+    locks of their domains until committed.
+
+    Returns
+    -------
+    tuple[int, int]
+        Number of records inserted and number of unchanged records found,
+        including skipped near-duplicates
+
+    """
+    if domain_locks is None or (dedupe is None and near_duplicates is None):
+        return _write_rows(
+            db, rows, dedupe, blob_store, search_language, near_duplicates
+        )
+    with domain_locks.hold(row["source_reverse"] for row in rows):
+        return _write_rows(
+            db, rows, dedupe, blob_store, search_language, near_duplicates
+        )
+
+
+def _write_rows(
+    db: DatabaseConnector,
+    rows: list[dict[str, Any]],
+    dedupe: Dedupe | None,
+    blob_store: BlobStore | None,
+    search_language: str | None,
+    near_duplicates: NearDuplicateFilter | None,
+) -> tuple[int, int]:
+    table = ScrapedData.__table__
+    insertion_date = datetime.now(timezone.utc)
+    rows = [{**row, "insertion_date": insertion_date} for row in rows]
+    unchanged = 0
+
+    if dedupe is not None:
+        latest = _latest_records(db, rows)
+        new_rows: list[dict[str, Any]] = []
+        seen_ids: list[Any] = []
+        for row in rows:
+            stored = latest.get(row["source"])
+            if stored is not None and stored[1] == row["content_hash"]:
+                seen_ids.append(stored[0])
+                continue
+            # Unchanged duplicates inside the same batch are stored once
+            latest[row["source"]] = (row["id"], row["content_hash"])
+            new_rows.append(row)
+        unchanged = len(rows) - len(new_rows)
+        rows = new_rows
+
+        if dedupe == "update" and seen_ids:
+            db.session.execute(
+                update(table)
+                .where(table.c.id.in_(seen_ids))
+                .values(insertion_date=insertion_date)
+            )
+
+    metrics = get_metrics()
+    if near_duplicates is not None and rows:
+        with metrics.timer("ingest_near_duplicate_seconds"):
+            matches = near_duplicates.match(db, rows)
+        metrics.counter(
+            "ingest_near_duplicate_rows",
+            sum(match is not None for match in matches),
+        )
+        if near_duplicates.mode == "skip":
+            kept = [row for row, match in zip(rows, matches) if match is None]
+            unchanged += len(rows) - len(kept)
+            rows = kept
+        else:
+            rows = [{**row, "duplicate_of": match} for row, match in zip(rows, matches)]
+
+    texts = [(row["id"], row["extracted_text"]) for row in rows]
+    if blob_store is not None and rows:
+        with metrics.timer("ingest_blob_seconds"):
+            keys = blob_store.put_many(row["extracted_text"] or "" for row in rows)
+        rows = [
+            {**row, "extracted_text": None, "text_blob": key}
+            for row, key in zip(rows, keys)
+        ]
+
+    with metrics.timer("ingest_commit_seconds"):
+        if rows:
+            db.session.execute(insert(table), rows)
+        if search_language is not None:
+            with metrics.timer("ingest_index_seconds"):
+                index_texts(db, texts, search_language)
+        db.session.commit()
+    if near_duplicates is not None:
+        near_duplicates.add(rows)
+    metrics.counter("ingest_rows", len(rows))
+    metrics.counter("ingest_unchanged_rows", unchanged)
+    logger.debug(f"Committed batch of {len(rows)} records")
+    return len(rows), unchanged
+
 
-def process_file(file_path: str) -> str:
+def _insert_batches(
+    db: DatabaseConnector,
+    items: Iterable[dict[str, Any]],
+    batch_size: int,
+    dedupe: Dedupe | None = None,
+    blob_store: BlobStore | None = None,
+    search_language: str | None = None,
+    near_duplicates: NearDuplicateFilter | None = None,
+) -> tuple[int, int]:
+    """Validate and insert raw records, one commit per batch.
+
+    Returns
+    -------
+    tuple[int, int]
+        Number of records inserted and number of unchanged records found
+
+    """
+    inserted = 0
+    unchanged = 0
+    for batch in batched(items, batch_size):
+        batch_inserted, batch_unchanged = _write_batch(
+            db,
+            _to_rows(batch, near_duplicates is not None),
+            dedupe,
+            blob_store,
+            search_language,
+            near_duplicates,
+        )
+        inserted += batch_inserted
+        unchanged += batch_unchanged
+    return inserted, unchanged
+
+
+def _search_language(settings: Settings) -> str | None:
+    """Text search configuration to index with, None if indexing is disabled."""
+    if not settings.db.full_text_search:
+        return None
+    return settings.db.search_language
+
+
+def _near_duplicate_filter(
+    near_duplicates: NearDuplicates | None, max_distance: int
+) -> NearDuplicateFilter | None:
+    if near_duplicates is None:
+        return None
+    return NearDuplicateFilter(near_duplicates, max_distance)
+
+
+def _status(count: int, unchanged: int, deduplicating: bool) -> str:
+    if deduplicating:
+        return f"Processed {count} records ({unchanged} unchanged)"
+    return f"Processed {count} records"
+
+
+def process_file(
+    file_path: str,
+    bulk: bool = False,
+    batch_size: int = 1000,
+    dedupe: Dedupe | None = None,
+    near_duplicates: NearDuplicates | None = None,
+    max_distance: int = 3,
+) -> str:
     """Read JSON file from scrape_website and save to database.
 
+    JSON arrays, newline-delimited JSON and gzip/zstd compressed variants are
+    detected automatically and parsed one record at a time. When a blob store
+    is configured (``BLOBS__BACKEND``), extracted texts are written there once
+    per distinct body and rows reference them through ``text_blob``. With
+    ``DB__FULL_TEXT_SEARCH`` enabled, texts are also added to the full-text
+    index searched by ``ScrapedDataQuery.search``.
+
     Parameters
     ----------
     file_path : str
         Path to the JSON file to process
+    bulk : bool, default False
+        Insert with batched Core statements instead of one ORM object per
+        record. Each batch is committed on its own, so a failure keeps the
+        batches already written.
+    batch_size : int, default 1000
+        Records per batch in bulk mode
+    dedupe : {"skip", "update"} or None, default None
+        How to treat pages whose content hash matches the latest stored row
+        of their source: ``"skip"`` leaves them out, ``"update"`` refreshes
+        the insertion date of that row instead of inserting a copy.
+        Deduplication always uses the batched path.
+    near_duplicates : {"flag", "skip"} or None, default None
+        How to treat pages whose SimHash fingerprint is within
+        ``max_distance`` bits of a stored version of the same URL: ``"flag"``
+        stores them with ``duplicate_of`` set to that version, ``"skip"``
+        leaves them out. Also uses the batched path. Fingerprints are only
+        computed and stored in this mode.
+    max_distance : int, default 3
+        Largest fingerprint Hamming distance counted as a near-duplicate
 
     Returns
     -------
@@ -30,34 +371,226 @@ def process_file(file_path: str) -> str:
     """
     logger.info(f"Processing file: {file_path}")
 
-    with open(file_path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    entities = []
-    if isinstance(data, list):
-        entities = [WebsiteEntity.model_validate(item) for item in data]
-    else:
-        entities = [WebsiteEntity.model_validate(data)]
+    settings = get_settings()
+    db_connector = DatabaseConnector(settings.db)
+    blob_store = get_blob_store(settings.blobs)
+    search_language = _search_language(settings)
+    metrics = get_metrics()
+    records = metrics.timed(iter_records(file_path), "ingest_parse_seconds")
 
-    settings = Settings()
-    db_connector = DatabaseConnector(settings.db.url)
+    deduplicating = dedupe is not None or near_duplicates is not None
+    if bulk or deduplicating:
+        with db_connector as db:
+            count, unchanged = _insert_batches(
+                db,
+                records,
+                batch_size,
+                dedupe,
+                blob_store,
+                search_language,
+                _near_duplicate_filter(near_duplicates, max_distance),
+            )
+        logger.info(f"Saved {count} records from {file_path}")
+        if deduplicating:
+            logger.info(f"Found {unchanged} unchanged records in {file_path}")
+        return _status(count, unchanged, deduplicating)
 
+    count = 0
+    texts: list[tuple[Any, str]] = []
     with db_connector as db:
-        for entity in entities:
+        for item in records:
+            with metrics.timer("ingest_validate_seconds"):
+                entity = WebsiteEntity.model_validate(item)
             record = ScrapedData()
             record.id = uuid.uuid4()
             record.set_source(entity.url)
-            record.extracted_text = (
-                entity.content_text or entity.content_markdown or entity.title or ""
+            record.extracted_text = _extracted_text(
+                entity.content_text, entity.content_markdown, entity.title
+            )
+            record.content_hash = _content_hash(
+                entity.content_hash, record.extracted_text
             )
-            record.insertion_date = datetime.now()
+            if search_language is not None:
+                texts.append((record.id, record.extracted_text))
+            if blob_store is not None:
+                with metrics.timer("ingest_blob_seconds"):
+                    record.text_blob = blob_store.put_text(record.extracted_text)
+                record.extracted_text = None
+            record.last_modified = entity.last_modified
+            record.etag = entity.metadata.get("etag")
+            record.insertion_date = datetime.now(timezone.utc)
 
             db.session.add(record)
+            count += 1
 
-        db.session.commit()
+        if search_language is not None:
+            with metrics.timer("ingest_index_seconds"):
+                index_texts(db, texts, search_language)
+        with metrics.timer("ingest_commit_seconds"):
+            db.session.commit()
+        metrics.counter("ingest_rows", count)
 
-    logger.info(f"Saved {len(entities)} records from {file_path}")
-    return f"Processed {len(entities)} records"
+    logger.info(f"Saved {count} records from {file_path}")
+    return f"Processed {count} records"
+
+
+def _next_batch(queue: "Queue[Any]", parsed: Future[None]) -> Any:
+    """Take the next batch off ``queue``, None once the parser has finished.
+
+    Also returns None if the parser process died without saying so.
+    """
+    while True:
+        try:
+            return queue.get(timeout=1.0)
+        except Empty:
+            if parsed.done():
+                try:
+                    return queue.get_nowait()
+                except Empty:
+                    return None
+
+
+def _write_parsed(
+    file_path: str,
+    parsed: Future[None],
+    queue: "Queue[Any]",
+    settings: Settings,
+    dedupe: Dedupe | None,
+    blob_store: BlobStore | None,
+    search_language: str | None,
+    near_duplicates: NearDuplicateFilter | None,
+    domain_locks: _DomainLocks,
+    in_flight: threading.BoundedSemaphore,
+) -> str:
+    """Write a file's rows to the database as its parser puts them on ``queue``."""
+    drained = False
+    try:
+        count = 0
+        unchanged = 0
+        with DatabaseConnector(settings.db) as db:
+            while True:
+                rows = _next_batch(queue, parsed)
+                if rows is None:
+                    drained = True
+                    break
+                batch_inserted, batch_unchanged = _write_batch(
+                    db,
+                    rows,
+                    dedupe,
+                    blob_store,
+                    search_language,
+                    near_duplicates,
+                    domain_locks,
+                )
+                count += batch_inserted
+                unchanged += batch_unchanged
+        # Raise the parser's error, if any, after writing what it produced
+        parsed.result()
+        logger.info(f"Saved {count} records from {file_path}")
+        return _status(
+            count, unchanged, dedupe is not None or near_duplicates is not None
+        )
+    finally:
+        # Unblock a parser waiting on a full queue after a write failed
+        while not drained and _next_batch(queue, parsed) is not None:
+            pass
+        in_flight.release()
+
+
+def process_files_parallel(
+    files: list[str],
+    max_workers: int | None = None,
+    db_workers: int = 2,
+    batch_size: int = 1000,
+    dedupe: Dedupe | None = None,
+    near_duplicates: NearDuplicates | None = None,
+    max_distance: int = 3,
+) -> list[str]:
+    """Process several files, parsing in processes and writing in threads.
+
+    JSON decoding and pydantic validation run on a process pool, while a
+    small thread pool writes the resulting rows through the shared database
+    engine. Parsers hand rows over one batch at a time through bounded
+    queues, and the number of files in flight is bounded, so memory stays
+    proportional to the worker counts and batch size rather than the file
+    sizes or the backlog. Deduplicated writes hold a per-domain lock from
+    lookup to commit, so files sharing pages never both insert them; runs
+    in separate processes are not coordinated.
+
+    Parameters
+    ----------
+    files : list[str]
+        Paths of the files to process
+    max_workers : int or None, default None
+        Parser processes, defaults to the number of CPUs
+    db_workers : int, default 2
+        Threads writing to the database concurrently
+    batch_size : int, default 1000
+        Records per insert batch
+    dedupe : {"skip", "update"} or None, default None
+        How to treat unchanged pages, see ``process_file``
+    near_duplicates : {"flag", "skip"} or None, default None
+        How to treat near-duplicate pages, see ``process_file``. One index
+        is shared by all files, so near-duplicates across files are found.
+    max_distance : int, default 3
+        Largest fingerprint Hamming distance counted as a near-duplicate
+
+    Returns
+    -------
+    list[str]
+        One status message per file, in input order
+
+    """
+    settings = get_settings()
+    blob_store = get_blob_store(settings.blobs)
+    search_language = _search_language(settings)
+    near_duplicate_filter = _near_duplicate_filter(near_duplicates, max_distance)
+    parser_count = max_workers or os.cpu_count() or 1
+    in_flight = threading.BoundedSemaphore(parser_count + db_workers)
+
+    domain_locks = _DomainLocks()
+
+    with (
+        multiprocessing.get_context("spawn").Manager() as manager,
+        ProcessPoolExecutor(
+            parser_count, mp_context=multiprocessing.get_context("spawn")
+        ) as parsers,
+        ThreadPoolExecutor(db_workers) as writers,
+    ):
+        written: list[Future[str]] = []
+        for file_path in files:
+            in_flight.acquire()
+            queue = manager.Queue(_QUEUED_BATCHES)
+            parsed = parsers.submit(
+                _parse_batches,
+                str(file_path),
+                batch_size,
+                queue,
+                near_duplicate_filter is not None,
+            )
+            written.append(
+                writers.submit(
+                    _write_parsed,
+                    str(file_path),
+                    parsed,
+                    queue,
+                    settings,
+                    dedupe,
+                    blob_store,
+                    search_language,
+                    near_duplicate_filter,
+                    domain_locks,
+                    in_flight,
+                )
+            )
+
+        results: list[str] = []
+        for future in written:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(f"Failed: {e}")
+    return results
 
 
 def process_detected_files(**context: Any) -> list[str]:
@@ -75,11 +608,34 @@ def process_detected_files(**context: Any) -> list[str]:
     files = context.get("files", [])
     if not files:
         return []
+    bulk = context.get("bulk", False)
+    batch_size = context.get("batch_size", 1000)
+    dedupe = context.get("dedupe")
+    near_duplicates = context.get("near_duplicates")
+    max_distance = context.get("max_distance", 3)
+
+    if context.get("parallel", False):
+        return process_files_parallel(
+            [str(file_path) for file_path in files],
+            max_workers=context.get("max_workers"),
+            db_workers=context.get("db_workers", 2),
+            batch_size=batch_size,
+            dedupe=dedupe,
+            near_duplicates=near_duplicates,
+            max_distance=max_distance,
+        )
 
     results: list[str] = []
     for file_path in files:
         try:
-            result = process_file(str(file_path))
+            result = process_file(
+                str(file_path),
+                bulk=bulk,
+                batch_size=batch_size,
+                dedupe=dedupe,
+                near_duplicates=near_duplicates,
+                max_distance=max_distance,
+            )
             results.append(result)
         except Exception as e:
             results.append(f"Failed: {e}")
@@ -0,0 +1,70 @@
+"""Database maintenance tasks for Airflow."""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from ...core.settings import get_settings
+from ..db.database import DatabaseConnector
+from ..db.partitions import ensure_partitions, is_partitioned
+from ..db.retention import apply_retention
+from ..storage.blob_store import get_blob_store
+
+logger = logging.getLogger(__name__)
+
+
+def maintain_scraped_data(
+    retention_days: int | None = None,
+    archive_dir: str | None = None,
+) -> str:
+    """Roll partitions forward and apply the retention policy.
+
+    On a partitioned PostgreSQL table, creates the partitions of the coming
+    months. When a retention period is set, archives whole months older
+    than it to Parquet and removes them, except for the latest row of each
+    page. Meant to run daily.
+
+    Parameters
+    ----------
+    retention_days : int or None, default None
+        Days of rows to keep, ``DB__RETENTION_DAYS`` when None; rows are
+        kept forever when neither is set
+    archive_dir : str or None, default None
+        Directory of the Parquet archives, ``DB__ARCHIVE_DIR`` when None;
+        old rows are removed without archiving when neither is set
+
+    Returns
+    -------
+    str
+        Status message
+
+    """
+    settings = get_settings()
+    if retention_days is None:
+        retention_days = settings.db.retention_days
+    if archive_dir is None:
+        archive_dir = settings.db.archive_dir
+
+    try:
+        with DatabaseConnector(settings.db) as db:
+            with db.engine.connect() as connection:
+                partitioned = is_partitioned(connection)
+            if partitioned:
+                partitions = ensure_partitions(
+                    db.engine, months_ahead=settings.db.partitions_ahead
+                )
+                logger.info(f"Ensured partitions up to {partitions[-1]}")
+
+            if retention_days is None:
+                return "Retention disabled"
+            before = datetime.now(timezone.utc) - timedelta(days=retention_days)
+            removed = apply_retention(
+                db, before, archive_dir, get_blob_store(settings.blobs)
+            )
+    except Exception as e:
+        logger.error(f"Maintenance of scraped_data failed: {e}")
+        return f"Failed: {e}"
+
+    logger.info(f"Removed {len(removed)} months older than {before:%Y-%m-%d}")
+    return f"Removed {len(removed)} months" + (
+        f" ({', '.join(removed)})" if removed else ""
+    )
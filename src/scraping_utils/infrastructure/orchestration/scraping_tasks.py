@@ -1,12 +1,12 @@
 """Web scraping tasks for Airflow."""
 
 import asyncio
-import json
 import logging
 import os
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Type, Any
+from typing import Any
 from urllib.parse import urlparse
 
 from scraping_utils.infrastructure.scraper.fircrawl_repository import (
@@ -15,17 +15,185 @@ from scraping_utils.infrastructure.scraper.fircrawl_repository import (
 
 from ..scraper.solotodo_repository import SoloTodoRepository
 from ..scraper.gg_deals_repository import GGDealsRepository
-from ...core.settings import Settings
-from ...domain.entities.website import WebsiteEntity
+from ...core.metrics import get_metrics
+from ...core.settings import Settings, get_settings
+from ...domain.repositories.website_repository import WebsiteRepository
+from ..db.crawl_state import load_page_states
+from ..db.database import DatabaseConnector
+from ..scraper.client_pool import client_pool
+from ..scraper.completion import WebhookReceiver
+from ..scraper.rate_limit import RateLimiter
+from ..scraper.response_cache import ResponseCache
+from ..scraper.router import DomainRouter, ScraperRoute
+from .artifacts import (
+    Compression,
+    OutputFormat,
+    RecordWriter,
+    artifact_suffix,
+    open_artifact,
+)
 
 logger = logging.getLogger(__name__)
 
+# Site-specific repositories; installed plugins add theirs on first lookup
+router = DomainRouter()
+router.register("solotodo.cl", SoloTodoRepository, concurrency=2)
+router.register("gg.deals", GGDealsRepository, concurrency=2)
+
+
+def _webhook_receiver(settings: Settings) -> WebhookReceiver | None:
+    """Create the completion webhook receiver, if enabled in settings."""
+    if not settings.firecrawl.webhook_enabled:
+        return None
+    return WebhookReceiver(
+        host=settings.firecrawl.webhook_host,
+        port=settings.firecrawl.webhook_port,
+        public_url=settings.firecrawl.webhook_public_url,
+    )
+
+
+def _rate_limiter(settings: Settings) -> RateLimiter | None:
+    """Create the shared rate limiter, if a state file is set in settings."""
+    config = settings.firecrawl
+    if config.rate_limit_path is None:
+        return None
+    return RateLimiter(
+        config.rate_limit_path,
+        rate=config.rate_limit_per_second,
+        burst=config.rate_limit_burst,
+        retry_budget=config.retry_budget,
+        retry_rate=config.retry_budget_per_second,
+    )
+
+
+def _response_cache(settings: Settings) -> ResponseCache | None:
+    """Create the crawl response cache, if a cache file is set in settings."""
+    config = settings.firecrawl
+    if config.cache_path is None:
+        return None
+    return ResponseCache(
+        config.cache_path, ttl=config.cache_ttl, max_bytes=config.cache_max_bytes
+    )
+
+
+def _build_repository(
+    url: str,
+    settings: Settings,
+    scraping_args: dict[str, Any] | None = None,
+    incremental: bool = False,
+    webhook: WebhookReceiver | None = None,
+) -> WebsiteRepository:
+    """Select and configure the repository for a URL.
+
+    Settings-derived arguments (the Firecrawl endpoint, webhook, checkpoint
+    directory, rate limiter, response cache and previous page states) are
+    only passed to repositories whose constructor takes them, so routes can
+    point at any ``WebsiteRepository`` such as ``HtmlRepository``.
+    """
+    domain = urlparse(url).netloc.lower()
+
+    route = router.resolve(url) or ScraperRoute(
+        domain=domain, repository_class=FirecrawlRepository
+    )
+
+    full_scraping_args: dict[str, Any] = {
+        "target_url": url,
+        **route.options,
+        **(scraping_args if scraping_args is not None else {}),
+    }
+    if route.accepts("base_url"):
+        full_scraping_args.setdefault("base_url", settings.firecrawl.base_url)
+    if route.accepts("api_key"):
+        full_scraping_args.setdefault("api_key", settings.firecrawl.api_key)
+    if webhook is not None and route.accepts("webhook"):
+        full_scraping_args["webhook"] = webhook
+    if settings.firecrawl.checkpoint_dir is not None and route.accepts(
+        "checkpoint_dir"
+    ):
+        full_scraping_args.setdefault(
+            "checkpoint_dir", settings.firecrawl.checkpoint_dir
+        )
+    if "rate_limiter" not in full_scraping_args and route.accepts("rate_limiter"):
+        full_scraping_args["rate_limiter"] = _rate_limiter(settings)
+    if "response_cache" not in full_scraping_args and route.accepts("response_cache"):
+        full_scraping_args["response_cache"] = _response_cache(settings)
+
+    if incremental and not route.accepts("previous_pages"):
+        logger.warning(
+            f"{route.repository_class.__name__} does not support incremental "
+            f"crawls, crawling every page of {domain}"
+        )
+    elif incremental:
+        with DatabaseConnector(settings.db) as db:
+            full_scraping_args["previous_pages"] = load_page_states(db, url)
+        logger.info(
+            f"Incremental crawl: {len(full_scraping_args['previous_pages'])} "
+            f"known pages for {domain}"
+        )
+
+    logger.info(f"Using {route.repository_class.__name__} for {domain}")
+
+    return route.repository_class(**full_scraping_args)
+
+
+async def _crawl_to_file(
+    url: str,
+    repository: WebsiteRepository,
+    output_dir: str,
+    output_format: OutputFormat = "json",
+    compression: Compression | None = None,
+) -> str:
+    """Stream crawled entities into an artifact file and return its path.
+
+    Entities are serialized one at a time as the repository yields them, so
+    memory use does not grow with the number of crawled pages. The file is
+    written under a ``.part`` suffix and only renamed once the crawl finishes.
+    """
+    # Create output directory and file path
+    domain = urlparse(url).netloc.lower()
+    os.makedirs(output_dir, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    domain_safe = domain.replace(".", "_")
+    suffix = artifact_suffix(output_format, compression)
+    output_file = Path(output_dir) / f"crawl_{domain_safe}_{timestamp}{suffix}"
+    partial_file = output_file.with_name(output_file.name + ".part")
+
+    metrics = get_metrics()
+    try:
+        with open_artifact(partial_file, "w", compression) as f:
+            writer = RecordWriter(f, output_format)
+            async for entity in repository.stream():
+                with metrics.timer("scrape_serialize_seconds"):
+                    # Use mode='json' to serialize datetime as strings
+                    text = writer.encode(entity.model_dump(mode="json"))
+                with metrics.timer("scrape_write_seconds"):
+                    writer.write_encoded(text)
+                metrics.histogram("scrape_record_bytes", len(text))
+            writer.close()
+        os.replace(partial_file, output_file)
+    except BaseException:
+        partial_file.unlink(missing_ok=True)
+        raise
+
+    logger.info(f"Crawl completed. Found {writer.count} pages")
+    logger.info(f"Results saved to: {output_file}")
+    return str(output_file)
+
 
 def scrape_website(
-    url: str, output_dir: str = "./data", scraping_args: dict[str, Any] | None = None
+    url: str,
+    output_dir: str = "./data",
+    scraping_args: dict[str, Any] | None = None,
+    output_format: OutputFormat = "json",
+    compression: Compression | None = None,
+    incremental: bool = False,
 ) -> str:
     """Crawl website and save as JSON file.
 
+    The crawl runs on its own event loop and closes its pooled Firecrawl
+    connections when done, so repeated calls do not share connections; use
+    ``scrape_websites`` to crawl several URLs over the same connections.
+
     Parameters
     ----------
     url : str
@@ -34,6 +202,13 @@ def scrape_website(
         Directory to save results
     scraping_args: dict[str, Any]
         Arguments to pass to the underlying scraper, that are not config based
+    output_format : {"json", "ndjson"}, default "json"
+        Write an indented JSON array or newline-delimited JSON
+    compression : {"gzip", "zstd"} or None, default None
+        Compress the output file
+    incremental : bool, default False
+        Leave out pages whose content is unchanged since they were last
+        ingested into the database
 
     Returns
     -------
@@ -43,61 +218,129 @@ def scrape_website(
     """
     logger.info(f"Crawl task called for: {url}")
 
-    # Parse domain to determine repository
-    parsed_url = urlparse(url)
-    domain = parsed_url.netloc.lower()
-
     # Load settings
-    settings = Settings()
-
-    # Repository mapping for known domains
-    repository_map: dict[str, Type[FirecrawlRepository]] = {
-        "solotodo.cl": SoloTodoRepository,
-        "www.solotodo.cl": SoloTodoRepository,
-        "gg.deals": GGDealsRepository,
-        "www.gg.deals": GGDealsRepository,
-    }
+    settings = get_settings()
 
-    full_scraping_args: dict[str, Any] = {
-        "base_url": settings.firecrawl.base_url,
-        "target_url": url,
-        "api_key": settings.firecrawl.api_key,
-        **(scraping_args if scraping_args is not None else {}),
-    }
+    webhook = _webhook_receiver(settings)
+    repository = _build_repository(url, settings, scraping_args, incremental, webhook)
 
-    # Select repository
-    if domain in repository_map:
-        repository_class = repository_map[domain]
-        logger.info(f"Using {repository_class.__name__} for {domain}")
-    else:
-        repository_class = FirecrawlRepository
-        logger.info(f"Using FirecrawlRepository for {domain}")
+    async def run() -> str:
+        crawl = _crawl_to_file(url, repository, output_dir, output_format, compression)
+        try:
+            if webhook is None:
+                return await crawl
+            async with webhook:
+                return await crawl
+        finally:
+            await client_pool.aclose()
 
-    repository = repository_class(**full_scraping_args)
+    return asyncio.run(run())
 
-    website_entities: list[WebsiteEntity] | None = asyncio.run(repository.get())
-    assert website_entities is not None
-    if not website_entities:
-        website_entities = []
-    logger.info(f"Crawl completed. Found {len(website_entities)} pages")
 
-    # Create output directory and file path
-    os.makedirs(output_dir, exist_ok=True)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    domain_safe = domain.replace(".", "_")
-    output_file = Path(output_dir) / f"crawl_{domain_safe}_{timestamp}.json"
+def scrape_websites(
+    urls: list[str],
+    output_dir: str = "./data",
+    scraping_args: dict[str, Any] | None = None,
+    max_concurrency: int = 16,
+    per_domain_limits: dict[str, int] | None = None,
+    default_domain_limit: int = 4,
+    output_format: OutputFormat = "json",
+    compression: Compression | None = None,
+    incremental: bool = False,
+) -> list[str]:
+    """Crawl several websites concurrently and save each as a JSON file.
+
+    Crawls against the same Firecrawl endpoint share one pooled client and
+    its keep-alive connections. The batch runs on its own event loop, and
+    the pool is closed when it ends, so connections are reused within one
+    call but not across calls; pass related URLs in one batch to benefit.
+
+    Parameters
+    ----------
+    urls : list[str]
+        Website URLs to crawl
+    output_dir : str, default "./data"
+        Directory to save results
+    scraping_args: dict[str, Any]
+        Arguments to pass to the underlying scrapers, that are not config based
+    max_concurrency : int, default 16
+        Maximum number of crawls running at the same time
+    per_domain_limits : dict[str, int] or None, default None
+        Maximum concurrent crawls per domain, overriding the concurrency of
+        the domain's route. Domains are matched without a leading ``www.``
+    default_domain_limit : int, default 4
+        Limit for domains missing from the per-domain limits
+    output_format : {"json", "ndjson"}, default "json"
+        Write an indented JSON array or newline-delimited JSON
+    compression : {"gzip", "zstd"} or None, default None
+        Compress the output files
+    incremental : bool, default False
+        Leave out pages whose content is unchanged since they were last
+        ingested into the database
 
-    # Convert entities to dict for JSON serialization
-    crawl_data: list[dict[str, Any]] = [
-        entity.model_dump(
-            mode="json"
-        )  # Use mode='json' to serialize datetime as strings
-        for entity in website_entities
-    ]
+    Returns
+    -------
+    list[str]
+        One result per URL, in input order: the saved file path, or
+        ``"Failed: <error>"`` when the crawl could not be completed
 
-    # Save to JSON
-    with open(output_file, "w", encoding="utf-8") as f:
-        json.dump(crawl_data, f, indent=2, ensure_ascii=False)
+    """
+    logger.info(f"Batch crawl task called for {len(urls)} URLs")
 
-    logger.info(f"Results saved to: {output_file}")
-    return str(output_file)
+    settings = get_settings()
+    limits = {
+        route.domain: route.concurrency
+        for route in router.routes()
+        if route.concurrency is not None
+    }
+    limits.update(
+        (domain.lower().removeprefix("www."), limit)
+        for domain, limit in (per_domain_limits or {}).items()
+    )
+    webhook = _webhook_receiver(settings)
+
+    async def run() -> list[str]:
+        global_semaphore = asyncio.Semaphore(max_concurrency)
+        domain_semaphores: dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(default_domain_limit)
+        )
+        for domain, limit in limits.items():
+            domain_semaphores[domain] = asyncio.Semaphore(limit)
+
+        def limit_key(url: str) -> str:
+            domain = urlparse(url).netloc.lower().removeprefix("www.")
+            if domain in limits:
+                return domain
+            # Subdomains share the limit of the site they are routed to
+            route = router.resolve(url)
+            return route.domain if route is not None else domain
+
+        async def crawl_one(url: str) -> str:
+            domain = limit_key(url)
+            try:
+                # Loading page states queries the database; keep it off the loop
+                repository = await asyncio.to_thread(
+                    _build_repository,
+                    url,
+                    settings,
+                    scraping_args,
+                    incremental,
+                    webhook,
+                )
+                async with domain_semaphores[domain], global_semaphore:
+                    return await _crawl_to_file(
+                        url, repository, output_dir, output_format, compression
+                    )
+            except Exception as e:
+                logger.warning(f"Crawl failed for {url}: {e}")
+                return f"Failed: {e}"
+
+        try:
+            if webhook is None:
+                return await asyncio.gather(*(crawl_one(url) for url in urls))
+            async with webhook:
+                return await asyncio.gather(*(crawl_one(url) for url in urls))
+        finally:
+            await client_pool.aclose()
+
+    return asyncio.run(run())
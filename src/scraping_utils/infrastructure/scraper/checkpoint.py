@@ -0,0 +1,119 @@
+"""On-disk checkpoints letting interrupted Firecrawl crawls resume."""
+
+import hashlib
+import json
+import os
+import shutil
+from collections.abc import Iterator
+from itertools import batched
+from pathlib import Path
+from typing import Any
+
+from firecrawl.types import Document
+from pydantic import BaseModel
+
+
+class CheckpointState(BaseModel):
+    """Progress of a crawl job as persisted in its spool directory."""
+
+    job_id: str
+    pages_fetched: int = 0
+    next_url: str | None = None
+    documents_offset: int = 0
+
+
+class CrawlCheckpoint:
+    """Spool directory holding a crawl's job id and the documents received.
+
+    Each distinct crawl (target URL, limit and scrape options) gets its own
+    directory. ``state.json`` records the Firecrawl job id and the cursor of
+    the next result page, and ``documents.ndjson`` the documents fetched so
+    far. The state is replaced atomically after each page, so a crawl killed
+    at any point resumes from its last complete page.
+
+    Parameters
+    ----------
+    directory : str or Path
+        Root spool directory shared by all crawls
+    key : dict[str, Any]
+        Parameters identifying the crawl
+
+    """
+
+    def __init__(self, directory: str | Path, key: dict[str, Any]):
+        digest = hashlib.sha256(
+            json.dumps(key, sort_keys=True, default=str).encode("utf-8")
+        ).hexdigest()[:32]
+        self.path = Path(directory) / digest
+        self._state_file = self.path / "state.json"
+        self._documents_file = self.path / "documents.ndjson"
+
+    def load(self) -> CheckpointState | None:
+        """Return the saved state, or None when there is nothing to resume."""
+        try:
+            return CheckpointState.model_validate_json(self._state_file.read_bytes())
+        except FileNotFoundError:
+            return None
+
+    def _save(self, state: CheckpointState) -> None:
+        temporary = self._state_file.with_suffix(".tmp")
+        temporary.write_text(state.model_dump_json(), encoding="utf-8")
+        os.replace(temporary, self._state_file)
+
+    def start(self, job_id: str) -> CheckpointState:
+        """Begin a checkpoint for a newly submitted crawl job."""
+        self.clear()
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._documents_file.touch()
+        state = CheckpointState(job_id=job_id)
+        self._save(state)
+        return state
+
+    def record_page(
+        self,
+        state: CheckpointState,
+        documents: list[Document],
+        next_url: str | None,
+    ) -> CheckpointState:
+        """Durably append a page of documents and advance the cursor."""
+        with open(self._documents_file, "r+b") as f:
+            # Drop anything written after the last recorded page
+            f.truncate(state.documents_offset)
+            f.seek(state.documents_offset)
+            for document in documents:
+                f.write(document.model_dump_json(exclude_none=True).encode("utf-8"))
+                f.write(b"\n")
+            f.flush()
+            os.fsync(f.fileno())
+            offset = f.tell()
+
+        state = state.model_copy(
+            update={
+                "pages_fetched": state.pages_fetched + 1,
+                "next_url": next_url,
+                "documents_offset": offset,
+            }
+        )
+        self._save(state)
+        return state
+
+    def replay(
+        self, state: CheckpointState, batch_size: int = 100
+    ) -> Iterator[list[Document]]:
+        """Yield the documents recorded so far, in batches."""
+
+        def lines() -> Iterator[bytes]:
+            position = 0
+            with open(self._documents_file, "rb") as f:
+                for line in f:
+                    position += len(line)
+                    if position > state.documents_offset:
+                        return
+                    yield line
+
+        for batch in batched(lines(), batch_size):
+            yield [Document.model_validate_json(line) for line in batch]
+
+    def clear(self) -> None:
+        """Delete the checkpoint once the crawl no longer needs it."""
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,97 @@
+"""Process-wide pool of Firecrawl clients with keep-alive connections."""
+
+import asyncio
+import threading
+from weakref import WeakKeyDictionary
+
+import httpx
+from firecrawl import AsyncFirecrawl
+
+
+class FirecrawlClientPool:
+    """Share Firecrawl clients between repositories of the same endpoint.
+
+    Clients are keyed by ``(base_url, api_key)``, so every crawl against an
+    endpoint reuses one SDK client and one ``httpx.AsyncClient`` whose
+    connections are kept alive between requests, instead of setting both up
+    and opening fresh connections per crawl. Connections belong to the event
+    loop that opened them, so each running loop gets its own clients; they
+    are dropped with the loop, or closed earlier with ``aclose``.
+
+    Parameters
+    ----------
+    max_connections : int, default 100
+        Connections per endpoint, all of which may be kept alive
+    keepalive_expiry : float, default 30.0
+        Seconds an idle connection stays open
+
+    """
+
+    def __init__(self, max_connections: int = 100, keepalive_expiry: float = 30.0):
+        self.max_connections = max_connections
+        self.keepalive_expiry = keepalive_expiry
+        self._clients: WeakKeyDictionary[
+            asyncio.AbstractEventLoop,
+            dict[tuple[str, str], tuple[AsyncFirecrawl, httpx.AsyncClient]],
+        ] = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def _create(
+        self, base_url: str, api_key: str
+    ) -> tuple[AsyncFirecrawl, httpx.AsyncClient]:
+        session = httpx.AsyncClient(
+            base_url=base_url,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+        client = AsyncFirecrawl(api_key=api_key, api_url=base_url)
+        # The SDK's async HTTP client disables keep-alive; route its requests
+        # through the pooled session instead. Its own client is unused and
+        # holds no connections.
+        http_client = getattr(
+            getattr(client, "_v2_client", None), "async_http_client", None
+        )
+        if isinstance(getattr(http_client, "_client", None), httpx.AsyncClient):
+            http_client._client = session  # type: ignore[union-attr]
+        return client, session
+
+    def _get(
+        self, base_url: str, api_key: str
+    ) -> tuple[AsyncFirecrawl, httpx.AsyncClient]:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.setdefault(loop, {})
+            key = (base_url, api_key)
+            if key not in clients:
+                clients[key] = self._create(base_url, api_key)
+            return clients[key]
+
+    def client(self, base_url: str, api_key: str) -> AsyncFirecrawl:
+        """Return the running loop's SDK client for an endpoint."""
+        return self._get(base_url, api_key)[0]
+
+    def session(self, base_url: str, api_key: str) -> httpx.AsyncClient:
+        """Return the running loop's HTTP session for an endpoint.
+
+        It carries the endpoint's base URL and authorization header and
+        shares its connections with the SDK client.
+        """
+        return self._get(base_url, api_key)[1]
+
+    async def aclose(self) -> None:
+        """Close the running loop's clients and their connections."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            clients = self._clients.pop(loop, {})
+        for _, session in clients.values():
+            await session.aclose()
+
+
+client_pool = FirecrawlClientPool()
@@ -0,0 +1,219 @@
+"""Crawl completion detection: adaptive polling and a local webhook receiver."""
+
+import asyncio
+import json
+import secrets
+import time
+from logging import Logger, getLogger
+from typing import Any
+
+from firecrawl.v2.types import WebhookConfig
+
+_MAX_BODY_BYTES = 16 * 1024 * 1024
+# Completion results kept for jobs whose state has not been forgotten yet
+_MAX_RESULTS = 10_000
+
+
+class AdaptivePoller:
+    """Compute status polling delays from a crawl job's progress.
+
+    While the job reports progress, the next delay is half the estimated
+    remaining time at the observed page rate. Without progress information
+    the delay grows geometrically. Delays are always kept within
+    ``[min_interval, max_interval]``, so small crawls are noticed within
+    seconds while long ones are not polled needlessly often.
+
+    Parameters
+    ----------
+    min_interval : float, default 1.0
+        Shortest delay between polls, in seconds
+    max_interval : float, default 30.0
+        Longest delay between polls, in seconds
+    backoff : float, default 1.5
+        Growth factor applied when there is no progress to extrapolate
+
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 1.0,
+        max_interval: float = 30.0,
+        backoff: float = 1.5,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max(min_interval, max_interval)
+        self.backoff = backoff
+        self._delay = min_interval / backoff
+        self._started_at: float | None = None
+
+    def next_delay(self, completed: int = 0, total: int = 0) -> float:
+        """Return the delay before the next poll given the job's progress."""
+        now = time.monotonic()
+        if self._started_at is None:
+            self._started_at = now
+        elapsed = now - self._started_at
+
+        if 0 < completed < total and elapsed > 0:
+            rate = completed / elapsed
+            delay = (total - completed) / rate / 2
+        else:
+            delay = self._delay * self.backoff
+
+        self._delay = min(max(delay, self.min_interval), self.max_interval)
+        return self._delay
+
+
+class WebhookReceiver:
+    """Minimal HTTP endpoint receiving Firecrawl crawl webhooks.
+
+    Runs on the current event loop. Crawls started with ``config()`` notify it
+    on completion or failure, waking ``wait`` immediately instead of at the
+    next poll. Polling remains the fallback if a webhook is lost.
+
+    Parameters
+    ----------
+    host : str, default "0.0.0.0"
+        Interface to listen on
+    port : int, default 0
+        Port to listen on, 0 picks a free one
+    public_url : str or None, default None
+        URL at which Firecrawl can reach this receiver. Defaults to
+        ``http://<host>:<port>``, which only works if Firecrawl runs locally.
+    token : str or None, default None
+        Shared secret Firecrawl must echo in the ``X-Webhook-Token`` header,
+        generated if not given
+
+    """
+
+    _logger: Logger = getLogger(__name__)
+
+    def __init__(
+        self,
+        host: str = "0.0.0.0",
+        port: int = 0,
+        public_url: str | None = None,
+        token: str | None = None,
+    ):
+        self.host = host
+        self.port = port
+        self.public_url = public_url
+        self.token = token or secrets.token_urlsafe(24)
+        self._server: asyncio.Server | None = None
+        self._events: dict[str, asyncio.Event] = {}
+        self._results: dict[str, str] = {}
+
+    @property
+    def url(self) -> str:
+        if self.public_url is not None:
+            return self.public_url
+        if self._server is None:
+            raise RuntimeError("Webhook receiver is not running.")
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/"
+
+    def config(self) -> WebhookConfig:
+        """Webhook configuration to submit with a crawl job."""
+        return WebhookConfig(
+            url=self.url,
+            headers={"X-Webhook-Token": self.token},
+            events=["completed", "failed"],
+        )
+
+    async def start(self) -> "WebhookReceiver":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "WebhookReceiver":
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.stop()
+
+    async def wait(self, job_id: str, timeout: float) -> str | None:
+        """Wait up to ``timeout`` seconds for a job's completion webhook.
+
+        Returns at once if the webhook has already arrived, so callers
+        polling in a loop must stop waiting on it once it has fired.
+
+        Returns
+        -------
+        str or None
+            The webhook event type, e.g. ``crawl.completed``, or None if no
+            webhook arrived in time
+
+        """
+        if job_id not in self._results:
+            event = self._events.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(event.wait(), timeout)
+            except TimeoutError:
+                return None
+            finally:
+                if self._events.get(job_id) is event:
+                    del self._events[job_id]
+        return self._results.get(job_id)
+
+    def forget(self, job_id: str) -> None:
+        """Drop the state kept for a finished job."""
+        self._events.pop(job_id, None)
+        self._results.pop(job_id, None)
+
+    def _dispatch(self, headers: dict[str, str], body: bytes) -> int:
+        if not secrets.compare_digest(headers.get("x-webhook-token", ""), self.token):
+            return 401
+        payload: Any = json.loads(body or b"{}")
+        if not isinstance(payload, dict):
+            return 400
+        job_id = payload.get("id") or payload.get("jobId")
+        event_type = payload.get("type")
+        if not job_id or not isinstance(job_id, str):
+            return 400
+        if isinstance(event_type, str) and event_type.endswith(("completed", "failed")):
+            self._logger.info(f"Webhook {event_type} received for job {job_id}")
+            # Results of jobs nobody waits on are dropped, oldest first
+            while len(self._results) >= _MAX_RESULTS:
+                del self._results[next(iter(self._results))]
+            self._results[job_id] = event_type
+            event = self._events.get(job_id)
+            if event is not None:
+                event.set()
+        return 200
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        status = 400
+        try:
+            request_line = await reader.readline()
+            headers: dict[str, str] = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+            length = int(headers.get("content-length", 0))
+            if not request_line.startswith(b"POST"):
+                status = 405
+            elif length > _MAX_BODY_BYTES:
+                status = 413
+            else:
+                status = self._dispatch(headers, await reader.readexactly(length))
+        except (ValueError, asyncio.IncompleteReadError) as e:
+            self._logger.warning(f"Malformed webhook request: {e}")
+        finally:
+            writer.write(
+                f"HTTP/1.1 {status} \r\nContent-Length: 0\r\n"
+                "Connection: close\r\n\r\n".encode("latin-1")
+            )
+            try:
+                await writer.drain()
+            finally:
+                writer.close()
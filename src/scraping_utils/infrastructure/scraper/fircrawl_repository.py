@@ -2,18 +2,60 @@
 
 import asyncio
 import hashlib
+import json
 import uuid
-import backoff
-from datetime import datetime
-from typing import Any
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping
+from functools import lru_cache, partial
+from datetime import datetime, timezone
+from typing import Any, TypeVar
+from urllib.parse import urlparse
 
-from firecrawl import FirecrawlApp
-from firecrawl.types import ScrapeOptions
+from firecrawl import AsyncFirecrawl
+from firecrawl.types import CrawlJob, Document, ScrapeOptions
+from firecrawl.v2.types import PaginationConfig
+from firecrawl.v2.utils.normalize import normalize_document_input
 from logging import getLogger, Logger
 
 
+from ...core.metrics import get_metrics
+from ...domain.entities.page_state import PageState
 from ...domain.entities.website import WebsiteEntity
 from ...domain.repositories.website_repository import WebsiteRepository
+from .checkpoint import CheckpointState, CrawlCheckpoint
+from .client_pool import client_pool
+from .completion import AdaptivePoller, WebhookReceiver
+from .rate_limit import RateLimiter, call_with_retries
+from .response_cache import CachedCrawl, CrawlRecorder, ResponseCache
+
+T = TypeVar("T")
+
+# Validated once: repositories only read their options
+_DEFAULT_SCRAPE_OPTIONS = ScrapeOptions.model_validate(
+    {
+        "formats": ["markdown", "html"],
+        "only_main_content": True,
+        "remove_base64_images": True,
+        "block_ads": True,
+        "wait_for": 2000,
+        "mobile": False,
+        "skip_tls_verification": True,
+    }
+)
+
+
+@lru_cache(maxsize=256)
+def _validate_cached(options: str) -> ScrapeOptions:
+    return ScrapeOptions.model_validate_json(options)
+
+
+def _validate_scrape_options(options: dict[str, Any]) -> ScrapeOptions:
+    """Validate scrape options, reusing the result for options seen before."""
+    try:
+        key = json.dumps(options, sort_keys=True)
+    except TypeError:
+        # Not JSON serializable, e.g. holds model instances
+        return ScrapeOptions.model_validate(options)
+    return _validate_cached(key)
 
 
 class CrawlingError(Exception):
@@ -37,7 +79,13 @@ class FirecrawlRepository(WebsiteRepository):
         limit: int = 2,
         interval: int = 60,
         timeout: int = 240,
-        
+        poll_interval: float = 1,
+        max_poll_interval: float = 30,
+        webhook: WebhookReceiver | None = None,
+        previous_pages: Mapping[str, PageState] | None = None,
+        checkpoint_dir: str | None = None,
+        rate_limiter: RateLimiter | None = None,
+        response_cache: ResponseCache | None = None,
     ):
         """Initialize the GG.deals repository.
 
@@ -51,114 +99,405 @@ class FirecrawlRepository(WebsiteRepository):
             Firecrawl API key (overrides settings if provided)
         scrape_options : dict[str, Any] or None, default None
             Additional scraping options
+        limit : int, default 2
+            Maximum number of pages to crawl
+        interval : int, default 60
+            Seconds to wait before re-polling a crawl that outlived ``timeout``
+        timeout : int, default 240
+            Seconds to poll a crawl job before handing control back to ``crawl``
+        poll_interval : float, default 1
+            Shortest delay in seconds between non-blocking status checks of a
+            running crawl job. Delays adapt to the job's progress.
+        max_poll_interval : float, default 30
+            Longest delay in seconds between status checks
+        webhook : WebhookReceiver or None, default None
+            Running receiver that Firecrawl notifies on completion, ending the
+            wait between status checks early
+        previous_pages : Mapping[str, PageState] or None, default None
+            Last known state per page URL. When given, the crawl runs in
+            incremental mode and pages whose content hash matches are not
+            emitted.
+        checkpoint_dir : str or None, default None
+            Directory where the crawl's job id and fetched result pages are
+            persisted. An interrupted crawl with the same target URL, limit
+            and scrape options then resumes the existing Firecrawl job from
+            its last fetched page instead of starting over.
+        rate_limiter : RateLimiter or None, default None
+            Limiter shared with other crawls of the same Firecrawl endpoint
+            and domain, possibly in other processes. Every request to
+            Firecrawl waits for a slot, and retries of transient failures
+            draw from its retry budget.
+        response_cache : ResponseCache or None, default None
+            Cache of finished crawls. A crawl of the same target URL with the
+            same limit and scrape options is replayed from it without
+            contacting Firecrawl, and fresh crawls are stored in it.
 
         """
         self.base_url = base_url
         self.api_key = api_key
         self.target_url = target_url
 
-        if self.api_key:
-            self.firecrawl = FirecrawlApp(api_key=self.api_key, api_url=self.base_url)
-        else:
-            self.firecrawl = FirecrawlApp(api_key="dummy", api_url=self.base_url)
-
-        self.scrape_options: ScrapeOptions = ScrapeOptions.model_validate(
-            {
-                "formats": ["markdown", "html"],
-                "only_main_content": True,
-                "remove_base64_images": True,
-                "block_ads": True,
-                "wait_for": 2000,
-                "mobile": False,
-                "skip_tls_verification": True,
-            }
+        self.scrape_options: ScrapeOptions = (
+            _DEFAULT_SCRAPE_OPTIONS
             if scrape_options is None
-            else scrape_options
+            else _validate_scrape_options(scrape_options)
         )
 
         self.limit = limit
         self.interval = interval
         self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.webhook = webhook
+        self.previous_pages = previous_pages
+        # Everything besides the target URL that shapes the crawl's results
+        self.crawl_options: dict[str, Any] = {
+            "limit": self.limit,
+            "scrape_options": self.scrape_options.model_dump(),
+        }
+        self.checkpoint = (
+            CrawlCheckpoint(
+                checkpoint_dir,
+                {
+                    "base_url": self.base_url,
+                    "target_url": self.target_url,
+                    **self.crawl_options,
+                },
+            )
+            if checkpoint_dir is not None
+            else None
+        )
+        self.rate_limiter = rate_limiter
+        self.response_cache = response_cache
+        self.rate_limit_key = (
+            f"{urlparse(self.base_url).netloc}|{urlparse(self.target_url).netloc}"
+        )
+
+    @property
+    def firecrawl(self) -> AsyncFirecrawl:
+        """Pooled Firecrawl client of the running event loop."""
+        return client_pool.client(self.base_url, self.api_key or "dummy")
+
+    async def _request(self, operation: Callable[[], Awaitable[T]]) -> T:
+        """Send a Firecrawl request, retrying only transient failures."""
+        return await call_with_retries(
+            operation, self.rate_limit_key, self.rate_limiter, self.retries
+        )
 
-    @backoff.on_exception(
-        backoff.expo,
-        Exception,
-        max_time=300,
-        max_tries=retries,
-    )
-    async def _handle_crawl(self):
+    async def _start_crawl(self) -> str:
+        """Submit a crawl job and return its Firecrawl job id."""
         self._logger.info(f"Starting crawl for: {self.target_url}")
         try:
-            crawl_job = self.firecrawl.crawl(
-                url=self.target_url,
-                limit=self.limit,
-                timeout=self.timeout,
-                scrape_options=self.scrape_options,
-                poll_interval=10,
+            response = await self._request(
+                lambda: self.firecrawl.start_crawl(
+                    url=self.target_url,
+                    limit=self.limit,
+                    scrape_options=self.scrape_options,
+                    webhook=self.webhook.config() if self.webhook else None,
+                )
             )
-            self._logger.info(f"Crawl job status: {crawl_job.status}")
-            return crawl_job
+            return response.id
         except Exception as e:
-            self._logger.warning(f"Error occurred while crawling: {e}")
+            self._logger.warning(f"Error occurred while starting crawl: {e}")
             raise e
 
-    async def crawl(self) -> list[WebsiteEntity]:
-        retry_count = 0
-        crawl_job = await self._handle_crawl()
+    async def _poll_crawl(self, job_id: str) -> CrawlJob:
+        """Poll a crawl job without blocking the event loop.
 
-        while "scraping" == crawl_job.status:
-            crawl_job = await self._handle_crawl()
+        Waits between status checks adapt to the job's progress and end early
+        when the webhook receiver reports completion. If the status still
+        says ``scraping`` after the webhook, it is polled every
+        ``poll_interval`` seconds until it catches up. Returns the first page
+        of results once the job leaves the ``scraping`` state, or the last
+        observed status if ``timeout`` elapses first.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        poller = AdaptivePoller(self.poll_interval, self.max_poll_interval)
+        notified = False
+        while True:
+            crawl_job = await self._request(
+                lambda: self.firecrawl.get_crawl_status(
+                    job_id, pagination_config=PaginationConfig(auto_paginate=False)
+                )
+            )
+            remaining = deadline - loop.time()
+            if crawl_job.status != "scraping" or remaining <= 0:
+                self._logger.info(f"Crawl job status: {crawl_job.status}")
+                if self.webhook is not None and crawl_job.status != "scraping":
+                    self.webhook.forget(job_id)
+                return crawl_job
 
-            if not crawl_job.status == "failed":
-                raise CrawlingError(f"Failed to crawl URL {self.target_url}")
+            if notified:
+                # The status endpoint lags the webhook; poll at the base rate
+                delay = min(self.poll_interval, remaining)
+            else:
+                delay = min(
+                    poller.next_delay(crawl_job.completed, crawl_job.total), remaining
+                )
+            with get_metrics().timer(
+                "firecrawl_poll_wait_seconds", repository=type(self).__name__
+            ):
+                if self.webhook is not None and not notified:
+                    notified = await self.webhook.wait(job_id, delay) is not None
+                else:
+                    await asyncio.sleep(delay)
 
-            if not crawl_job.data:
-                raise CrawlingError(f"No data returned for URL: {self.target_url}")
+    async def _iter_pages(
+        self, crawl_job: CrawlJob, state: CheckpointState | None = None
+    ) -> AsyncIterator[list[Document]]:
+        """Yield the result pages of a finished crawl job as they are fetched.
 
-            await asyncio.sleep(self.interval)
+        Only the current page is held in memory; ``next`` cursors are followed
+        lazily as the consumer asks for more. With a checkpoint, each page is
+        persisted before it is yielded, and pages fetched by an earlier,
+        interrupted run are replayed from disk first.
+        """
+        if state is not None and state.pages_fetched:
+            assert self.checkpoint is not None
+            self._logger.info(
+                f"Replaying {state.pages_fetched} checkpointed pages "
+                f"for {self.target_url}"
+            )
+            for documents in self.checkpoint.replay(state):
+                yield documents
+            next_url = state.next_url
+        else:
+            next_url = crawl_job.next
+            if state is not None:
+                assert self.checkpoint is not None
+                state = self.checkpoint.record_page(state, crawl_job.data, next_url)
+            yield crawl_job.data
+        if not next_url:
+            return
 
+        session = client_pool.session(self.base_url, self.api_key or "dummy")
+
+        async def fetch(url: str) -> dict[str, Any]:
+            with get_metrics().timer(
+                "firecrawl_page_fetch_seconds", repository=type(self).__name__
+            ):
+                response = await session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            return response.json()
+
+        while next_url:
+            body = await self._request(partial(fetch, next_url))
+            documents = [
+                Document(**normalize_document_input(item))
+                for item in body.get("data", [])
+                if isinstance(item, dict)
+            ]
+            next_url = body.get("next")
+            if state is not None:
+                assert self.checkpoint is not None
+                state = self.checkpoint.record_page(state, documents, next_url)
+            yield documents
+
+    async def _resume(self) -> tuple[CheckpointState, CrawlJob] | None:
+        """Reattach to the crawl job recorded in the checkpoint, if any."""
+        if self.checkpoint is None:
+            return None
+        state = self.checkpoint.load()
+        if state is None:
+            return None
+
+        self._logger.info(
+            f"Resuming crawl job {state.job_id} for {self.target_url} "
+            f"after {state.pages_fetched} fetched pages"
+        )
+        try:
+            return state, await self._handle_crawl(state.job_id)
+        except Exception as e:
+            # The job may have expired on the Firecrawl side
+            self._logger.warning(
+                f"Cannot resume crawl job {state.job_id}, starting over: {e}"
+            )
+            self.checkpoint.clear()
+            return None
+
+    async def _handle_crawl(self, job_id: str | None = None) -> CrawlJob:
+        with get_metrics().timer(
+            "firecrawl_handle_crawl_seconds", repository=type(self).__name__
+        ):
+            if job_id is None:
+                job_id = await self._start_crawl()
+            return await self._poll_crawl(job_id)
+
+    @staticmethod
+    def _parse_datetime(value: str | None) -> datetime | None:
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+
+    @staticmethod
+    def _utc(value: datetime) -> datetime:
+        if value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value.astimezone(timezone.utc)
+
+    def _is_unchanged(self, entity: WebsiteEntity) -> bool:
+        """Whether a page matches its stored state and can be skipped.
+
+        The content hash must match. A page whose ``last_modified`` moved
+        while its content stayed the same is still stored, so the stored
+        validators stay current for conditional requests. Firecrawl does
+        not return an ETag, so the stored one is not compared here.
+        """
+        if self.previous_pages is None:
+            return False
+        previous = self.previous_pages.get(entity.url)
+        if previous is None or previous.content_hash != entity.content_hash:
+            return False
+        if previous.last_modified is None or entity.last_modified is None:
+            return True
+        return self._utc(previous.last_modified) == self._utc(entity.last_modified)
+
+    def _to_entity(self, document: Document, crawl_job: CrawlJob) -> WebsiteEntity:
+        metrics = get_metrics()
+        repository = type(self).__name__
+        markdown = document.markdown.encode("utf-8") if document.markdown else b""
+        html = document.html.encode("utf-8") if document.html else b""
+        if markdown:
+            content_hash = hashlib.md5(markdown).hexdigest()
+        elif html:
+            content_hash = hashlib.md5(html).hexdigest()
+        else:
+            raise ValueError("No content found in document")
+        metrics.histogram(
+            "firecrawl_page_bytes", len(markdown) + len(html), repository=repository
+        )
+
+        with metrics.timer("firecrawl_entity_build_seconds", repository=repository):
+            return self._build_entity(document, crawl_job, content_hash)
+
+    def _build_entity(
+        self, document: Document, crawl_job: CrawlJob, content_hash: str
+    ) -> WebsiteEntity:
+        assert document.metadata is not None
+        return WebsiteEntity(
+            id=str(uuid.uuid4()),
+            url=document.metadata.url or "",
+            scraped_at=datetime.now(),
+            title=document.metadata.title,
+            description=document.metadata.description,
+            content_markdown=document.markdown,
+            content_html=document.html,
+            content_text=document.markdown,  # Keep it simple
+            links=document.links or [],
+            language=document.metadata.language,
+            status_code=document.metadata.status_code,
+            is_successful=True,
+            last_modified=self._parse_datetime(document.metadata.modified_time),
+            metadata={
+                "source": self.target_url,
+                "firecrawl_metadata": document.metadata.model_dump()
+                if document.metadata
+                else {},
+                "credits_used": crawl_job.credits_used,
+            },
+            content_hash=content_hash,
+        )
+
+    async def _fetch_pages(
+        self,
+    ) -> tuple[CrawlJob, AsyncIterator[list[Document]]]:
+        """Run the crawl job, or resume it, and return its result pages."""
+        retry_count = 0
+        state: CheckpointState | None = None
+        resumed = await self._resume()
+        if resumed is not None:
+            state, crawl_job = resumed
+            job_id = state.job_id
+        else:
+            job_id = await self._start_crawl()
+            if self.checkpoint is not None:
+                state = self.checkpoint.start(job_id)
+            crawl_job = await self._handle_crawl(job_id)
+
+        while "scraping" == crawl_job.status:
             retry_count += 1
             if retry_count > self.retries:
                 raise CrawlingError(f"Max retries exceeded for URL: {self.target_url}")
 
-        entities: list[WebsiteEntity] = []
-        for document in crawl_job.data:
-            if document.markdown:
-                content_hash = hashlib.md5(
-                    document.markdown.encode("utf-8")
-                ).hexdigest()
-            elif document.html:
-                content_hash = hashlib.md5(document.html.encode("utf-8")).hexdigest()
-            else:
-                raise ValueError("No content found in document")
-
-            assert document.metadata is not None
-            entities.append(
-                WebsiteEntity(
-                    id=str(uuid.uuid4()),
-                    url=document.metadata.url or "",
-                    scraped_at=datetime.now(),
-                    title=document.metadata.title,
-                    description=document.metadata.description,
-                    content_markdown=document.markdown,
-                    content_html=document.html,
-                    content_text=document.markdown,  # Keep it simple
-                    links=document.links or [],
-                    language=document.metadata.language,
-                    status_code=document.metadata.status_code,
-                    is_successful=True,
-                    metadata={
-                        "source": self.target_url,
-                        "firecrawl_metadata": document.metadata.model_dump()
-                        if document.metadata
-                        else {},
-                        "credits_used": crawl_job.credits_used,
-                    },
-                    content_hash=content_hash,
+            await asyncio.sleep(self.interval)
+            crawl_job = await self._handle_crawl(job_id)
+
+        if crawl_job.status == "failed":
+            if self.checkpoint is not None:
+                self.checkpoint.clear()
+            raise CrawlingError(f"Failed to crawl URL {self.target_url}")
+
+        get_metrics().counter(
+            "firecrawl_credits_used",
+            crawl_job.credits_used,
+            repository=type(self).__name__,
+        )
+        return crawl_job, self._iter_pages(crawl_job, state)
+
+    @staticmethod
+    async def _replay(cached: CachedCrawl) -> AsyncIterator[list[Document]]:
+        pages = cached.pages()
+        while (documents := await asyncio.to_thread(next, pages, None)) is not None:
+            yield documents
+
+    async def stream(self) -> AsyncIterator[WebsiteEntity]:
+        # Cache I/O may wait on SQLite locks held by other processes, so it
+        # runs in worker threads to keep the other crawls going
+        cache_key = ResponseCache.key(self.target_url, self.crawl_options)
+        cached = (
+            await asyncio.to_thread(self.response_cache.get, cache_key)
+            if self.response_cache is not None
+            else None
+        )
+        recorder: CrawlRecorder | None = None
+        if cached is not None:
+            self._logger.info(f"Replaying cached crawl of {self.target_url}")
+            crawl_job, pages = cached.crawl_job, self._replay(cached)
+        else:
+            crawl_job, pages = await self._fetch_pages()
+            if self.response_cache is not None:
+                recorder = await asyncio.to_thread(
+                    self.response_cache.record, cache_key, self.target_url
                 )
-            )
 
-        return entities
+        metrics = get_metrics()
+        repository = type(self).__name__
+        unchanged = 0
+        try:
+            async for documents in pages:
+                if recorder is not None:
+                    await asyncio.to_thread(recorder.add, documents)
+                for document in documents:
+                    entity = self._to_entity(document, crawl_job)
+                    if self._is_unchanged(entity):
+                        unchanged += 1
+                        metrics.counter(
+                            "firecrawl_unchanged_pages", repository=repository
+                        )
+                        continue
+                    metrics.counter("firecrawl_pages", repository=repository)
+                    yield entity
+        except BaseException:
+            if recorder is not None:
+                await asyncio.to_thread(recorder.discard)
+            raise
+
+        if recorder is not None:
+            await asyncio.to_thread(recorder.commit, crawl_job)
+        if self.checkpoint is not None and cached is None:
+            self.checkpoint.clear()
+        if unchanged:
+            self._logger.info(f"Skipped {unchanged} unchanged pages")
+
+    async def crawl(self) -> list[WebsiteEntity]:
+        with get_metrics().timer(
+            "firecrawl_crawl_seconds", repository=type(self).__name__
+        ):
+            return [entity async for entity in self.stream()]
 
     async def get(self) -> list[WebsiteEntity] | None:
         return await self.crawl()
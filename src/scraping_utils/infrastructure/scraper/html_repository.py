@@ -0,0 +1,298 @@
+"""Local HTML repository implementation using httpx and lxml."""
+
+import asyncio
+import hashlib
+import uuid
+from collections import deque
+from collections.abc import AsyncIterator, Mapping
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from logging import Logger, getLogger
+from typing import Any
+from urllib.parse import urldefrag, urlparse
+
+import httpx
+from lxml import etree
+from lxml import html as lxml_html
+
+from ...domain.entities.page_state import PageState
+from ...domain.entities.website import WebsiteEntity
+from .base_scraper import BaseScraper
+
+_BLOCK_TAGS = (
+    "address",
+    "article",
+    "aside",
+    "blockquote",
+    "br",
+    "dd",
+    "div",
+    "dl",
+    "dt",
+    "fieldset",
+    "figcaption",
+    "figure",
+    "footer",
+    "form",
+    "h1",
+    "h2",
+    "h3",
+    "h4",
+    "h5",
+    "h6",
+    "header",
+    "hr",
+    "li",
+    "main",
+    "nav",
+    "ol",
+    "p",
+    "pre",
+    "section",
+    "table",
+    "td",
+    "th",
+    "tr",
+    "ul",
+)
+
+
+class HtmlRepository(BaseScraper):
+    """Repository that fetches pages directly and extracts them locally.
+
+    Suited to static pages that need no browser rendering: pages are
+    downloaded over a pooled ``httpx.AsyncClient`` and parsed with lxml,
+    skipping the Firecrawl round trip entirely. Links on the same host are
+    followed breadth-first until ``limit`` pages have been fetched.
+    """
+
+    _logger: Logger = getLogger(__name__)
+
+    def __init__(
+        self,
+        target_url: str,
+        limit: int = 2,
+        max_concurrency: int = 8,
+        timeout: int = 30,
+        headers: dict[str, str] | None = None,
+        previous_pages: Mapping[str, PageState] | None = None,
+    ):
+        """Initialize the HTML repository.
+
+        Parameters
+        ----------
+        target_url : str
+            URL to start crawling from
+        limit : int, default 2
+            Maximum number of pages to fetch
+        max_concurrency : int, default 8
+            Maximum concurrent requests, also the connection pool size
+        timeout : int, default 30
+            Per-request timeout in seconds
+        headers : dict[str, str] or None, default None
+            Extra request headers
+        previous_pages : Mapping[str, PageState] or None, default None
+            Last known state per page URL. Stored ETag and Last-Modified
+            values are sent as conditional request headers, and pages that
+            are not modified or whose content hash matches are not emitted.
+
+        """
+        super().__init__(name="html")
+        self.target_url = target_url
+        self.limit = limit
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.headers = headers or {}
+        self.previous_pages = previous_pages
+
+    def _conditional_headers(self, url: str) -> dict[str, str]:
+        previous = (self.previous_pages or {}).get(url)
+        if previous is None:
+            return {}
+        headers: dict[str, str] = {}
+        if previous.etag:
+            headers["If-None-Match"] = previous.etag
+        if previous.last_modified:
+            last_modified = previous.last_modified
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+            headers["If-Modified-Since"] = format_datetime(
+                last_modified.astimezone(timezone.utc), usegmt=True
+            )
+        return headers
+
+    @staticmethod
+    def _parse_http_date(value: str | None) -> datetime | None:
+        if not value:
+            return None
+        try:
+            return parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+
+    def _extract(self, url: str, response: httpx.Response) -> WebsiteEntity:
+        """Build an entity from an HTML response."""
+        content_html = response.text
+        # Parse the raw bytes so lxml honours an XML or meta encoding
+        # declaration, unless the Content-Type header names a charset
+        parser = (
+            lxml_html.HTMLParser(encoding=response.charset_encoding)
+            if response.charset_encoding
+            else None
+        )
+        document = lxml_html.document_fromstring(
+            response.content, parser=parser, base_url=url
+        )
+        document.make_links_absolute(url, resolve_base_href=True)
+
+        def first(*expressions: str) -> str | None:
+            for expression in expressions:
+                values = document.xpath(expression)
+                if values and str(values[0]).strip():
+                    return " ".join(str(values[0]).split())
+            return None
+
+        title = first("//title/text()", "//meta[@property='og:title']/@content")
+        description = first(
+            "//meta[@name='description']/@content",
+            "//meta[@property='og:description']/@content",
+        )
+        language = first("/html/@lang")
+
+        links: list[str] = []
+        for href in document.xpath("//a/@href"):
+            link = urldefrag(str(href)).url
+            if urlparse(link).scheme in ("http", "https") and link not in links:
+                links.append(link)
+        images: list[str] = []
+        for src in document.xpath("//img/@src"):
+            if str(src) not in images:
+                images.append(str(src))
+
+        for element in document.xpath("//script|//style|//noscript|//template"):
+            element.drop_tree()
+        body = document.find("body")
+        if body is None:
+            body = document
+        # Break lines around block elements so paragraphs do not run together
+        for element in body.iter(*_BLOCK_TAGS):
+            element.text = "\n" + (element.text or "")
+            element.tail = "\n" + (element.tail or "")
+        lines = (" ".join(line.split()) for line in body.text_content().splitlines())
+        content_text = "\n".join(line for line in lines if line)
+        content_hash = hashlib.md5(content_text.encode("utf-8")).hexdigest()
+
+        metadata: dict[str, Any] = {
+            "source": self.target_url,
+            "content_type": response.headers.get("content-type"),
+        }
+        if "etag" in response.headers:
+            metadata["etag"] = response.headers["etag"]
+
+        return WebsiteEntity(
+            id=str(uuid.uuid4()),
+            url=url,
+            scraped_at=datetime.now(),
+            title=title,
+            description=description,
+            content_html=content_html,
+            content_text=content_text,
+            links=links,
+            images=images,
+            language=language,
+            status_code=response.status_code,
+            is_successful=True,
+            last_modified=self._parse_http_date(response.headers.get("last-modified")),
+            metadata=metadata,
+            content_hash=content_hash,
+        )
+
+    async def _fetch(self, url: str) -> WebsiteEntity | None:
+        """Fetch and extract a page, returning None when there is nothing to parse.
+
+        Unreachable, failed, non-HTML and unparseable pages are skipped, so
+        one bad page never aborts the crawl.
+        """
+        try:
+            response = await self._session.get(
+                url, headers=self._conditional_headers(url)
+            )
+        except httpx.HTTPError as e:
+            self._logger.warning(f"Error occurred while fetching {url}: {e}")
+            return None
+
+        if response.status_code == 304:
+            return None
+        if response.status_code >= 400:
+            self._logger.warning(f"HTTP {response.status_code} fetching {url}")
+            return None
+        if "html" not in response.headers.get("content-type", ""):
+            return None
+
+        # Parsing is CPU-bound, keep it off the event loop
+        try:
+            return await asyncio.to_thread(self._extract, str(response.url), response)
+        except (etree.ParserError, ValueError) as e:
+            self._logger.warning(f"Skipping {url}, its HTML could not be parsed: {e}")
+            return None
+
+    def _is_unchanged(self, entity: WebsiteEntity) -> bool:
+        if self.previous_pages is None:
+            return False
+        previous = self.previous_pages.get(entity.url)
+        return previous is not None and previous.content_hash == entity.content_hash
+
+    async def stream(self) -> AsyncIterator[WebsiteEntity]:
+        host = urlparse(self.target_url).netloc
+        frontier: deque[str] = deque([self.target_url])
+        # Known pages may answer 304 without links, so queue them up front
+        for url in self.previous_pages or {}:
+            if urlparse(url).netloc == host and url != self.target_url:
+                frontier.append(url)
+        seen = set(frontier)
+        scheduled = 0
+        pending: set[asyncio.Task[WebsiteEntity | None]] = set()
+
+        self._session = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+            ),
+        )
+        try:
+            while frontier or pending:
+                while (
+                    frontier
+                    and len(pending) < self.max_concurrency
+                    and scheduled < self.limit
+                ):
+                    pending.add(asyncio.create_task(self._fetch(frontier.popleft())))
+                    scheduled += 1
+                if not pending:
+                    break
+
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    entity = task.result()
+                    if entity is None:
+                        continue
+                    for link in entity.links:
+                        if urlparse(link).netloc == host and link not in seen:
+                            seen.add(link)
+                            frontier.append(link)
+                    if self._is_unchanged(entity):
+                        continue
+                    yield entity
+        finally:
+            for task in pending:
+                task.cancel()
+            await self._session.aclose()
+            self._session = None
+
+    async def get(self) -> list[WebsiteEntity]:
+        return [entity async for entity in self.stream()]
@@ -0,0 +1,260 @@
+"""Request rate limiting and retry budgets shared by crawl workers on a host.
+
+Token buckets live in a SQLite file, so every process and thread pointing at
+the same file draws from the same per-key budget. Keys combine the Firecrawl
+endpoint and the crawled domain.
+"""
+
+import asyncio
+import random
+import sqlite3
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from email.utils import parsedate_to_datetime
+from logging import Logger, getLogger
+from typing import Any, TypeVar
+
+import httpx
+from firecrawl.v2.utils.error_handler import FirecrawlError
+
+from ...core.metrics import get_metrics
+
+T = TypeVar("T")
+
+_logger: Logger = getLogger(__name__)
+
+_RETRYABLE_STATUS = frozenset({408, 425, 429})
+
+
+def _status_code(error: BaseException) -> int | None:
+    if isinstance(error, FirecrawlError):
+        return error.status_code
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Tell transient failures from permanent ones.
+
+    Timeouts, connection errors, 408/425/429 and 5xx responses are worth
+    retrying; anything else, such as 4xx responses or programming errors,
+    would fail again.
+    """
+    status = _status_code(error)
+    if status is not None:
+        return status in _RETRYABLE_STATUS or status >= 500
+    return isinstance(
+        error, (httpx.TimeoutException, httpx.TransportError, TimeoutError)
+    )
+
+
+def retry_after(error: BaseException) -> float | None:
+    """Return the delay requested by a ``Retry-After`` header, if any."""
+    response: Any = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    value = headers.get("retry-after") if headers is not None else None
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token-bucket rate limiter and retry budget backed by SQLite.
+
+    Each key has a request bucket refilled at ``rate`` tokens per second up
+    to ``burst``. A request reserves a token even when the bucket is empty
+    and waits until its reservation comes due, so concurrent workers are
+    served in order at exactly the configured rate. A separate bucket per key
+    budgets retries: once it runs dry, failures are raised instead of
+    retried, keeping a struggling site from being hammered.
+
+    Parameters
+    ----------
+    path : str
+        SQLite file shared by the workers
+    rate : float, default 2.0
+        Requests per second allowed per key
+    burst : float, default 5.0
+        Requests that may be sent at once after an idle period
+    retry_budget : float, default 10.0
+        Retries that may be spent at once per key
+    retry_rate : float, default 0.1
+        Retries regained per second per key
+
+    """
+
+    def __init__(
+        self,
+        path: str,
+        rate: float = 2.0,
+        burst: float = 5.0,
+        retry_budget: float = 10.0,
+        retry_rate: float = 0.1,
+    ):
+        self.path = path
+        self.rate = rate
+        self.burst = burst
+        self.retry_budget = retry_budget
+        self.retry_rate = retry_rate
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS buckets ("
+                "key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+            self._local.connection = connection
+        return connection
+
+    def _update(
+        self,
+        key: str,
+        rate: float,
+        capacity: float,
+        change: Callable[[float], tuple[float, float]],
+    ) -> float:
+        """Refill a bucket, apply ``change`` to its tokens and return its result.
+
+        ``change`` maps the current tokens to the new tokens and the value to
+        return; it runs inside an immediate transaction, so it is atomic
+        across processes.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = connection.execute(
+                "SELECT tokens, updated FROM buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens = capacity
+            if row is not None:
+                tokens = min(capacity, row[0] + max(now - row[1], 0.0) * rate)
+            tokens, result = change(tokens)
+            connection.execute(
+                "INSERT OR REPLACE INTO buckets (key, tokens, updated) "
+                "VALUES (?, ?, ?)",
+                (key, tokens, now),
+            )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        return result
+
+    def reserve(self, key: str) -> float:
+        """Reserve a request slot and return the seconds to wait before using it."""
+        return self._update(
+            f"rate:{key}",
+            self.rate,
+            self.burst,
+            lambda tokens: (tokens - 1, max(1 - tokens, 0.0) / self.rate),
+        )
+
+    def spend_retry(self, key: str) -> bool:
+        """Take one retry from the key's budget, False if it is exhausted."""
+        return bool(
+            self._update(
+                f"retry:{key}",
+                self.retry_rate,
+                self.retry_budget,
+                lambda tokens: (tokens - 1, 1.0) if tokens >= 1 else (tokens, 0.0),
+            )
+        )
+
+    def pause(self, key: str, seconds: float) -> None:
+        """Hold back every worker's requests for a key, e.g. after a 429."""
+        self._update(
+            f"rate:{key}",
+            self.rate,
+            self.burst,
+            lambda tokens: (min(tokens, -seconds * self.rate), 0.0),
+        )
+
+    async def acquire(self, key: str) -> None:
+        """Wait for the key's next request slot."""
+        delay = await asyncio.to_thread(self.reserve, key)
+        if delay > 0:
+            get_metrics().histogram("rate_limit_wait_seconds", delay)
+            await asyncio.sleep(delay)
+
+
+async def call_with_retries(
+    operation: Callable[[], Awaitable[T]],
+    key: str,
+    limiter: RateLimiter | None = None,
+    max_tries: int = 3,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+) -> T:
+    """Run a request, retrying transient failures within the key's budget.
+
+    Every attempt waits for a rate limiter slot. Failures that
+    ``is_retryable`` rejects are raised at once. Retryable ones are retried
+    after the server's ``Retry-After`` or an exponential backoff with full
+    jitter, as long as attempts and the key's retry budget remain. A 429
+    pauses the key for every worker sharing the limiter.
+
+    Parameters
+    ----------
+    operation : Callable[[], Awaitable[T]]
+        Coroutine function performing one attempt
+    key : str
+        Rate limiter key, e.g. Firecrawl host and crawled domain
+    limiter : RateLimiter or None, default None
+        Shared limiter; without one, only the retry policy applies
+    max_tries : int, default 3
+        Maximum attempts
+    base_delay : float, default 1.0
+        Backoff before the first retry, in seconds
+    max_delay : float, default 60.0
+        Longest wait between attempts, in seconds
+
+    Returns
+    -------
+    T
+        The operation's result
+
+    """
+    metrics = get_metrics()
+    attempt = 1
+    while True:
+        if limiter is not None:
+            await limiter.acquire(key)
+        try:
+            return await operation()
+        except Exception as e:
+            if not is_retryable(e) or attempt >= max_tries:
+                raise
+            if limiter is not None and not await asyncio.to_thread(
+                limiter.spend_retry, key
+            ):
+                _logger.warning(f"Retry budget exhausted for {key}: {e}")
+                metrics.counter("retry_budget_exhausted")
+                raise
+
+            delay = retry_after(e)
+            if delay is None:
+                delay = random.uniform(0, base_delay * 2 ** (attempt - 1))
+            delay = min(delay, max_delay)
+            if limiter is not None and _status_code(e) == 429:
+                await asyncio.to_thread(limiter.pause, key, delay)
+            _logger.warning(
+                f"Attempt {attempt} for {key} failed, retrying in {delay:.1f}s: {e}"
+            )
+            metrics.counter("request_retries")
+            await asyncio.sleep(delay)
+            attempt += 1
@@ -0,0 +1,267 @@
+"""On-disk cache of finished Firecrawl crawls for development and re-runs."""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import uuid
+import zlib
+from collections.abc import Iterator
+from typing import Any
+
+from firecrawl.types import CrawlJob, Document
+
+from ...core.metrics import get_metrics
+
+# Age after which an incomplete recording is taken as abandoned
+_STALE_RECORDING_SECONDS = 86400.0
+
+
+class CachedCrawl:
+    """A cache hit: the crawl job summary and its stored result pages."""
+
+    def __init__(self, cache: "ResponseCache", key: str, crawl_job: CrawlJob):
+        self._cache = cache
+        self.key = key
+        self.crawl_job = crawl_job
+
+    def pages(self) -> Iterator[list[Document]]:
+        """Yield the stored result pages in crawl order, one at a time.
+
+        Each page is read on the calling thread's connection, so the
+        iterator may be advanced from worker threads.
+        """
+        sequence = -1
+        while True:
+            row = (
+                self._cache._connection()
+                .execute(
+                    "SELECT sequence, body FROM pages WHERE key = ? AND sequence > ? "
+                    "ORDER BY sequence LIMIT 1",
+                    (self.key, sequence),
+                )
+                .fetchone()
+            )
+            if row is None:
+                return
+            sequence, body = row
+            yield [
+                Document.model_validate(item)
+                for item in json.loads(zlib.decompress(body))
+            ]
+
+
+class CrawlRecorder:
+    """Stores the result pages of a running crawl as they are fetched.
+
+    Pages are written under a key of their own, so recordings of the same
+    crawl running at once never touch each other's rows. Nothing is visible
+    to readers until ``commit`` moves the recording under the crawl's key,
+    replacing the previous entry; the last recording to commit wins. An
+    abandoned recording is removed by ``discard``, or by eviction once stale.
+    """
+
+    def __init__(self, cache: "ResponseCache", key: str, target_url: str):
+        self._cache = cache
+        self.key = key
+        self._recording = f"{key}.{uuid.uuid4().hex}"
+        self._sequence = 0
+        self._size = 0
+        with cache._connection() as connection:
+            connection.execute(
+                "INSERT INTO crawls (key, target_url, created, accessed, size, "
+                "complete) VALUES (?, ?, ?, ?, 0, 0)",
+                (self._recording, target_url, time.time(), time.time()),
+            )
+
+    @staticmethod
+    def _delete(connection: sqlite3.Connection, key: str) -> None:
+        connection.execute("DELETE FROM pages WHERE key = ?", (key,))
+        connection.execute("DELETE FROM crawls WHERE key = ?", (key,))
+
+    def add(self, documents: list[Document]) -> None:
+        """Store one page of documents."""
+        body = zlib.compress(
+            json.dumps(
+                [
+                    document.model_dump(mode="json", exclude_none=True)
+                    for document in documents
+                ]
+            ).encode("utf-8"),
+            self._cache.level,
+        )
+        with self._cache._connection() as connection:
+            connection.execute(
+                "INSERT INTO pages (key, sequence, body) VALUES (?, ?, ?)",
+                (self._recording, self._sequence, body),
+            )
+        self._sequence += 1
+        self._size += len(body)
+
+    def commit(self, crawl_job: CrawlJob) -> None:
+        """Publish the recorded crawl, then evict expired and excess entries."""
+        summary = crawl_job.model_dump_json(exclude={"data", "next"})
+        with self._cache._connection() as connection:
+            self._delete(connection, self.key)
+            connection.execute(
+                "UPDATE pages SET key = ? WHERE key = ?", (self.key, self._recording)
+            )
+            connection.execute(
+                "UPDATE crawls SET key = ?, complete = 1, size = ?, job = ? "
+                "WHERE key = ?",
+                (self.key, self._size, summary, self._recording),
+            )
+        get_metrics().histogram("response_cache_entry_bytes", self._size)
+        self._cache.evict()
+
+    def discard(self) -> None:
+        """Drop a recording that will not be completed."""
+        with self._cache._connection() as connection:
+            self._delete(connection, self._recording)
+
+
+class ResponseCache:
+    """SQLite cache of crawl results keyed by target URL and crawl options.
+
+    Finished crawls are stored page by page, zlib-compressed, so a repeated
+    crawl of the same URL with the same options is replayed from local disk
+    instead of being sent to Firecrawl again. Entries expire after ``ttl``
+    seconds, and when the stored bytes exceed ``max_bytes`` the least
+    recently used entries are evicted. Meant for development, re-extraction
+    and backfill runs; processes can share one file.
+
+    Parameters
+    ----------
+    path : str
+        SQLite file holding the cache
+    ttl : float or None, default 86400
+        Seconds a crawl stays valid, None to keep it until evicted for size
+    max_bytes : int, default 1 GiB
+        Largest total size of stored pages
+    level : int, default 6
+        zlib compression level
+
+    """
+
+    def __init__(
+        self,
+        path: str,
+        ttl: float | None = 86400,
+        max_bytes: int = 1 << 30,
+        level: int = 6,
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.level = level
+        self._local = threading.local()
+
+    @staticmethod
+    def key(target_url: str, options: dict[str, Any]) -> str:
+        """Cache key of a crawl: its target URL and the options shaping results."""
+        return hashlib.sha256(
+            json.dumps(
+                {"target_url": target_url, **options}, sort_keys=True, default=str
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(
+                "CREATE TABLE IF NOT EXISTS crawls ("
+                "key TEXT PRIMARY KEY, target_url TEXT NOT NULL, job TEXT, "
+                "created REAL NOT NULL, accessed REAL NOT NULL, "
+                "size INTEGER NOT NULL, complete INTEGER NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS idx_crawls_accessed "
+                "ON crawls (accessed);"
+                "CREATE TABLE IF NOT EXISTS pages ("
+                "key TEXT NOT NULL, sequence INTEGER NOT NULL, body BLOB NOT NULL, "
+                "PRIMARY KEY (key, sequence));"
+            )
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> CachedCrawl | None:
+        """Return a complete, unexpired crawl and mark it recently used."""
+        metrics = get_metrics()
+        with self._connection() as connection:
+            row = connection.execute(
+                "SELECT job, created FROM crawls WHERE key = ? AND complete = 1",
+                (key,),
+            ).fetchone()
+            if row is None or (
+                self.ttl is not None and row[1] < time.time() - self.ttl
+            ):
+                metrics.counter("response_cache_misses")
+                return None
+            connection.execute(
+                "UPDATE crawls SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+        metrics.counter("response_cache_hits")
+        return CachedCrawl(self, key, CrawlJob.model_validate_json(row[0]))
+
+    def record(self, key: str, target_url: str) -> CrawlRecorder:
+        """Start storing a crawl under ``key``, replacing any previous entry."""
+        return CrawlRecorder(self, key, target_url)
+
+    def evict(self) -> int:
+        """Remove expired entries, then least recently used ones over the size limit.
+
+        Recordings left incomplete for longer than a day, e.g. by a killed
+        process, are removed as well.
+
+        Returns
+        -------
+        int
+            Number of entries removed
+
+        """
+        with self._connection() as connection:
+            doomed: list[str] = [
+                key
+                for (key,) in connection.execute(
+                    "SELECT key FROM crawls WHERE complete = 0 AND created < ?",
+                    (time.time() - _STALE_RECORDING_SECONDS,),
+                )
+            ]
+            if self.ttl is not None:
+                doomed.extend(
+                    key
+                    for (key,) in connection.execute(
+                        "SELECT key FROM crawls WHERE complete = 1 AND created < ?",
+                        (time.time() - self.ttl,),
+                    )
+                )
+            total = connection.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM crawls WHERE created >= ?",
+                (time.time() - self.ttl if self.ttl is not None else 0,),
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                for key, size in connection.execute(
+                    "SELECT key, size FROM crawls WHERE complete = 1 ORDER BY accessed"
+                ).fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    if key not in doomed:
+                        doomed.append(key)
+                        total -= size
+            connection.executemany(
+                "DELETE FROM pages WHERE key = ?", [(key,) for key in doomed]
+            )
+            connection.executemany(
+                "DELETE FROM crawls WHERE key = ?", [(key,) for key in doomed]
+            )
+        if doomed:
+            get_metrics().counter("response_cache_evictions", len(doomed))
+        return len(doomed)
+
+    def clear(self) -> None:
+        """Remove every cached crawl."""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM pages")
+            connection.execute("DELETE FROM crawls")
@@ -0,0 +1,208 @@
+"""Routing of crawl URLs to site-specific repositories.
+
+Sites register a ``WebsiteRepository`` class for a domain, such as a
+``FirecrawlRepository`` subclass or ``HtmlRepository``, either in code or
+from an installed package through the ``scraping_utils.scrapers`` entry
+point group. An entry point names a callable that receives the
+``DomainRouter`` and registers its sites, e.g. in the plugin's
+``pyproject.toml``::
+
+    [project.entry-points."scraping_utils.scrapers"]
+    my_site = "my_package.scrapers:register"
+"""
+
+import inspect
+import threading
+from collections.abc import Callable
+from functools import lru_cache
+from importlib.metadata import entry_points
+from logging import Logger, getLogger
+from typing import Any, TypeVar
+from urllib.parse import urlparse
+
+from pydantic import BaseModel, ConfigDict
+
+from ..db.models.scraped_data import _reverse_netloc
+from ...domain.repositories.website_repository import WebsiteRepository
+
+ENTRY_POINT_GROUP = "scraping_utils.scrapers"
+
+R = TypeVar("R", bound=type[WebsiteRepository])
+
+_logger: Logger = getLogger(__name__)
+
+
+class ScraperRoute(BaseModel):
+    """A site registration: the repository class and options for a domain."""
+
+    model_config = ConfigDict(frozen=True)
+
+    domain: str
+    repository_class: type[WebsiteRepository]
+    include_subdomains: bool = True
+    concurrency: int | None = None
+    options: dict[str, Any] = {}
+
+    def accepts(self, argument: str) -> bool:
+        """Whether the repository's constructor takes ``argument``.
+
+        Lets callers pass settings such as the Firecrawl endpoint or a rate
+        limiter only to repositories that use them.
+        """
+        parameters = inspect.signature(self.repository_class).parameters.values()
+        return any(
+            parameter.name == argument
+            or parameter.kind is inspect.Parameter.VAR_KEYWORD
+            for parameter in parameters
+        )
+
+
+class _Node:
+    __slots__ = ("children", "route", "exact_route")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        # Route for the domain and its subdomains, and for the domain only
+        self.route: ScraperRoute | None = None
+        self.exact_route: ScraperRoute | None = None
+
+
+def _labels(domain: str) -> list[str]:
+    netloc = urlparse(domain).netloc if "//" in domain else domain
+    return _reverse_netloc(netloc.strip(".")).split(".")
+
+
+class DomainRouter:
+    """Resolve domains to registered scrapers through a suffix trie.
+
+    Domains are stored label by label in reversed order, as in
+    ``ScrapedData.source_reverse``, so a lookup walks one trie node per label
+    of the URL's host and returns the most specific registration: a route
+    for ``solotodo.cl`` also serves ``www.solotodo.cl`` and
+    ``m.solotodo.cl`` unless a subdomain has a route of its own. Resolved
+    hosts are cached, and plugins from the entry point group are loaded on
+    the first lookup.
+
+    Parameters
+    ----------
+    entry_point_group : str or None, default "scraping_utils.scrapers"
+        Entry point group to load plugins from, None to disable plugins
+
+    """
+
+    def __init__(self, entry_point_group: str | None = ENTRY_POINT_GROUP):
+        self.entry_point_group = entry_point_group
+        self._root = _Node()
+        self._routes: dict[str, ScraperRoute] = {}
+        self._plugins_loaded = entry_point_group is None
+        self._lock = threading.RLock()
+        self._resolve_host = lru_cache(maxsize=4096)(self._walk)
+
+    def register(
+        self,
+        domain: str,
+        repository_class: type[WebsiteRepository],
+        include_subdomains: bool = True,
+        concurrency: int | None = None,
+        **options: Any,
+    ) -> ScraperRoute:
+        """Register a repository for a domain, replacing any previous one.
+
+        Parameters
+        ----------
+        domain : str
+            Domain such as ``solotodo.cl``; a URL is also accepted
+        repository_class : type[WebsiteRepository]
+            Repository crawling the domain, constructed with the URL as
+            ``target_url``
+        include_subdomains : bool, default True
+            Also route subdomains without a registration of their own
+        concurrency : int or None, default None
+            Concurrent crawls allowed for the domain in batch scraping
+        **options : Any
+            Default constructor arguments of the repository for this domain,
+            overridden by the caller's scraping arguments
+
+        Returns
+        -------
+        ScraperRoute
+            The registered route
+
+        """
+        labels = _labels(domain)
+        route = ScraperRoute(
+            domain=".".join(reversed(labels)),
+            repository_class=repository_class,
+            include_subdomains=include_subdomains,
+            concurrency=concurrency,
+            options=options,
+        )
+        with self._lock:
+            node = self._root
+            for label in labels:
+                node = node.children.setdefault(label, _Node())
+            if include_subdomains:
+                node.route = route
+            else:
+                node.exact_route = route
+            self._routes[route.domain] = route
+            self._resolve_host.cache_clear()
+        return route
+
+    def route(
+        self,
+        domain: str,
+        include_subdomains: bool = True,
+        concurrency: int | None = None,
+        **options: Any,
+    ) -> Callable[[R], R]:
+        """Class decorator form of ``register``."""
+
+        def decorator(repository_class: R) -> R:
+            self.register(
+                domain, repository_class, include_subdomains, concurrency, **options
+            )
+            return repository_class
+
+        return decorator
+
+    def load_plugins(self) -> None:
+        """Let installed plugins register their sites, once per router."""
+        with self._lock:
+            if self._plugins_loaded:
+                return
+            self._plugins_loaded = True
+            assert self.entry_point_group is not None
+            for entry_point in entry_points(group=self.entry_point_group):
+                try:
+                    entry_point.load()(self)
+                    _logger.info(f"Loaded scraper plugin {entry_point.name}")
+                except Exception as e:
+                    _logger.warning(
+                        f"Failed to load scraper plugin {entry_point.name}: {e}"
+                    )
+
+    def _walk(self, host: str) -> ScraperRoute | None:
+        labels = _labels(host)
+        node = self._root
+        best = node.route
+        for label in labels:
+            child = node.children.get(label)
+            if child is None:
+                return best
+            node = child
+            best = node.route or best
+        return node.exact_route or best
+
+    def resolve(self, url: str) -> ScraperRoute | None:
+        """Return the most specific route for a URL or host, None if unrouted."""
+        if not self._plugins_loaded:
+            self.load_plugins()
+        host = urlparse(url).netloc if "//" in url else url
+        return self._resolve_host(host.lower())
+
+    def routes(self) -> list[ScraperRoute]:
+        """All registered routes, plugins included."""
+        if not self._plugins_loaded:
+            self.load_plugins()
+        return list(self._routes.values())
@@ -0,0 +1,322 @@
+"""Content-addressed storage for page bodies.
+
+Bodies are stored once per distinct content under the SHA-256 of their
+uncompressed bytes and compressed with zstd, so storage grows with unique
+content rather than with the number of crawls.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from ...core.metrics import get_metrics
+from ...core.settings import BlobStoreConfig
+
+
+def _zstandard() -> Any:
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "The blob store requires the 'zstandard' package. "
+            "Install it with the 'zstd' extra."
+        ) from e
+    return zstandard
+
+
+# Blobs written or reused within this many seconds are never garbage
+# collected, so an ingest that found a blob has time to commit its reference
+GC_GRACE_SECONDS = 86400.0
+
+
+def blob_key(data: bytes) -> str:
+    """Return the content address of a body."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore(ABC):
+    """Abstract content-addressed store of zstd-compressed bodies.
+
+    Parameters
+    ----------
+    level : int, default 3
+        zstd compression level
+
+    """
+
+    def __init__(self, level: int = 3):
+        self.level = level
+        self._local = threading.local()
+
+    # zstd contexts are not thread-safe, keep one pair per thread
+    def _compress(self, data: bytes) -> bytes:
+        if not hasattr(self._local, "compressor"):
+            self._local.compressor = _zstandard().ZstdCompressor(level=self.level)
+        return self._local.compressor.compress(data)
+
+    def _decompress(self, data: bytes) -> bytes:
+        if not hasattr(self._local, "decompressor"):
+            self._local.decompressor = _zstandard().ZstdDecompressor()
+        return self._local.decompressor.decompress(data)
+
+    @abstractmethod
+    def modified(self, key: str) -> float | None:
+        """Return when a blob was last written or reused, None if not stored."""
+        pass
+
+    @abstractmethod
+    def _touch(self, key: str) -> None:
+        """Mark a stored blob as reused now."""
+        pass
+
+    def exists(self, key: str) -> bool:
+        """Check whether a blob is stored."""
+        return self.modified(key) is not None
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove a blob if it is stored.
+
+        Blobs are shared by every record with the same text, so only delete
+        keys that no record references anymore.
+        """
+        pass
+
+    @abstractmethod
+    def _read(self, key: str) -> bytes:
+        """Return the compressed bytes of a blob, raising KeyError if missing."""
+        pass
+
+    @abstractmethod
+    def _write(self, key: str, data: bytes) -> None:
+        """Store the compressed bytes of a blob."""
+        pass
+
+    def put(self, data: bytes) -> str:
+        """Store a body unless already present and return its key.
+
+        A blob found already stored is touched once it is half the garbage
+        collection grace period old, so ``delete_idle`` leaves it alone
+        while the caller commits its reference.
+        """
+        key = blob_key(data)
+        metrics = get_metrics()
+        modified = self.modified(key)
+        if modified is not None:
+            if modified < time.time() - GC_GRACE_SECONDS / 2:
+                self._touch(key)
+            metrics.counter("blob_dedup_hits")
+            return key
+        compressed = self._compress(data)
+        self._write(key, compressed)
+        metrics.counter("blob_writes")
+        metrics.counter("blob_written_bytes", len(compressed))
+        return key
+
+    def put_text(self, text: str) -> str:
+        """Store a UTF-8 text body and return its key."""
+        return self.put(text.encode("utf-8"))
+
+    def put_many(self, texts: Iterable[str]) -> list[str]:
+        """Store text bodies, writing each distinct one at most once."""
+        stored: dict[str, str] = {}
+        keys: list[str] = []
+        for text in texts:
+            key = stored.get(text)
+            if key is None:
+                key = stored[text] = self.put_text(text)
+            keys.append(key)
+        return keys
+
+    def delete_idle(self, key: str, grace: float = GC_GRACE_SECONDS) -> bool:
+        """Delete a blob unless it was written or reused within ``grace`` seconds.
+
+        Returns
+        -------
+        bool
+            Whether the blob was deleted
+
+        """
+        modified = self.modified(key)
+        if modified is None or modified >= time.time() - grace:
+            return False
+        self.delete(key)
+        return True
+
+    def get(self, key: str) -> bytes:
+        """Return a stored body.
+
+        Raises
+        ------
+        KeyError
+            If no blob is stored under ``key``
+
+        """
+        return self._decompress(self._read(key))
+
+    def get_text(self, key: str) -> str:
+        """Return a stored UTF-8 text body."""
+        return self.get(key).decode("utf-8")
+
+
+class FilesystemBlobStore(BlobStore):
+    """Blob store in a local directory, fanned out by key prefix.
+
+    Blobs live at ``<root>/<key[:2]>/<key[2:4]>/<key>.zst`` and are written
+    through a temporary file and an atomic rename, so concurrent writers of
+    the same content never expose a partial blob.
+
+    Parameters
+    ----------
+    root : str or Path
+        Directory holding the blobs
+    level : int, default 3
+        zstd compression level
+
+    """
+
+    def __init__(self, root: str | Path, level: int = 3):
+        super().__init__(level)
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / key[2:4] / f"{key}.zst"
+
+    def modified(self, key: str) -> float | None:
+        try:
+            return self._path(key).stat().st_mtime
+        except FileNotFoundError:
+            return None
+
+    def _touch(self, key: str) -> None:
+        try:
+            os.utime(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+
+    def _read(self, key: str) -> bytes:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(key) from None
+
+    def _write(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as f:
+                f.write(data)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+class S3BlobStore(BlobStore):
+    """Blob store in an S3-compatible bucket.
+
+    Works with AWS S3 and with local stand-ins such as MinIO or LocalStack
+    through ``endpoint_url``. Requires ``boto3`` unless a client is given.
+
+    Parameters
+    ----------
+    bucket : str
+        Bucket name
+    prefix : str, default "blobs/"
+        Key prefix for every blob
+    endpoint_url : str or None, default None
+        Endpoint of an S3-compatible service, AWS when None
+    client : Any or None, default None
+        Preconfigured S3 client, created with ``boto3`` if not given
+    level : int, default 3
+        zstd compression level
+
+    """
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "blobs/",
+        endpoint_url: str | None = None,
+        client: Any | None = None,
+        level: int = 3,
+    ):
+        super().__init__(level)
+        if client is None:
+            try:
+                import boto3
+            except ImportError as e:
+                raise ImportError(
+                    "S3BlobStore requires the 'boto3' package. "
+                    "Install it with the 's3' extra."
+                ) from e
+            client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.bucket = bucket
+        self.prefix = prefix
+        self.client = client
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}{key[:2]}/{key}.zst"
+
+    def modified(self, key: str) -> float | None:
+        try:
+            response = self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey"):
+                return None
+            raise
+        return response["LastModified"].timestamp()
+
+    def _touch(self, key: str) -> None:
+        # Copying an object onto itself with new metadata resets LastModified
+        self.client.copy_object(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            CopySource={"Bucket": self.bucket, "Key": self._key(key)},
+            ContentType="application/zstd",
+            MetadataDirective="REPLACE",
+        )
+
+    def delete(self, key: str) -> None:
+        self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+
+    def _read(self, key: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(key))
+        except self.client.exceptions.NoSuchKey:
+            raise KeyError(key) from None
+        return response["Body"].read()
+
+    def _write(self, key: str, data: bytes) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self._key(key),
+            Body=data,
+            ContentType="application/zstd",
+        )
+
+
+def get_blob_store(config: BlobStoreConfig) -> BlobStore | None:
+    """Create the blob store described by ``config``, or None if disabled."""
+    if config.backend is None:
+        return None
+    if config.backend == "filesystem":
+        return FilesystemBlobStore(config.path, level=config.level)
+    if config.bucket is None:
+        raise ValueError("BLOBS__BUCKET is required for the s3 blob store")
+    return S3BlobStore(
+        config.bucket,
+        prefix=config.prefix,
+        endpoint_url=config.endpoint_url,
+        level=config.level,
+    )
@@ -0,0 +1,227 @@
+"""Bounded-memory Parquet file and dataset writing."""
+
+import os
+import re
+import uuid
+from collections import OrderedDict
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from types import TracebackType
+from typing import Any
+
+
+def pyarrow() -> Any:
+    """Import ``pyarrow`` with its Parquet module, or explain how to get it."""
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError as e:
+        raise ImportError(
+            "Parquet output requires the 'pyarrow' package. "
+            "Install it with the 'parquet' extra."
+        ) from e
+    return pyarrow
+
+
+class ParquetBatchWriter:
+    """Write dict rows to a Parquet file one record batch at a time.
+
+    Rows are buffered until ``batch_size`` of them are pending, then written
+    as a row group, so memory is bounded by one batch whatever the file
+    size. The file is written under a ``.part`` suffix and only renamed
+    once ``close`` succeeds; leaving the context on an error removes it.
+
+    Parameters
+    ----------
+    path : str or Path
+        Destination file
+    schema : pyarrow.Schema
+        Schema of the rows
+    batch_size : int, default 10_000
+        Rows per row group
+    compression : str, default "zstd"
+        Parquet compression codec
+    dictionary_columns : Sequence[str] or None, default None
+        Columns to dictionary-encode, such as repetitive URLs; None encodes
+        every column
+
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        schema: Any,
+        batch_size: int = 10_000,
+        compression: str = "zstd",
+        dictionary_columns: Sequence[str] | None = None,
+    ):
+        pa = pyarrow()
+        self.path = Path(path)
+        self.schema = schema
+        self.batch_size = batch_size
+        self.rows_written = 0
+        self._pending: list[dict[str, Any]] = []
+        self._partial = self.path.with_name(self.path.name + ".part")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = pa.parquet.ParquetWriter(
+            self._partial,
+            schema,
+            compression=compression,
+            use_dictionary=list(dictionary_columns)
+            if dictionary_columns is not None
+            else True,
+        )
+
+    def write(self, row: dict[str, Any]) -> None:
+        """Add a row, flushing a row group when the batch is full."""
+        self._pending.append(row)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the pending rows as a row group."""
+        if not self._pending:
+            return
+        batch = pyarrow().RecordBatch.from_pylist(self._pending, schema=self.schema)
+        self._writer.write_batch(batch)
+        self.rows_written += len(self._pending)
+        self._pending.clear()
+
+    def close(self) -> None:
+        """Flush, finish the file and move it into place."""
+        self.flush()
+        self._writer.close()
+        os.replace(self._partial, self.path)
+
+    def abort(self) -> None:
+        """Discard the partial file."""
+        self._writer.close()
+        self._partial.unlink(missing_ok=True)
+
+    def __enter__(self) -> "ParquetBatchWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+_UNSAFE_PATH_CHARACTERS = re.compile(r"[^\w.@+-]")
+
+
+class PartitionedParquetWriter:
+    """Write dict rows to a Hive-partitioned Parquet dataset.
+
+    Each row goes to ``<root>/<key>=<value>/.../part-<run>-<n>.parquet``
+    for its partition values, the layout that pyarrow, DuckDB, Spark and
+    Polars read as partition columns. At most ``max_open_files`` partitions
+    have an open file at once; writing to another one closes the least
+    recently used file, and the partition gets a new part file if it comes
+    up again. Memory therefore stays below ``max_open_files * batch_size``
+    buffered rows, and feeding rows grouped by partition keeps one file per
+    partition.
+
+    Parameters
+    ----------
+    root : str or Path
+        Dataset directory
+    schema : pyarrow.Schema
+        Schema of the rows; partition values only appear in directory
+        names, so they should not reuse column names
+    batch_size : int, default 10_000
+        Rows per row group
+    compression : str, default "zstd"
+        Parquet compression codec
+    dictionary_columns : Sequence[str] or None, default None
+        Columns to dictionary-encode; None encodes every column
+    max_open_files : int, default 16
+        Partition files kept open at once
+
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        schema: Any,
+        batch_size: int = 10_000,
+        compression: str = "zstd",
+        dictionary_columns: Sequence[str] | None = None,
+        max_open_files: int = 16,
+    ):
+        self.root = Path(root)
+        self.schema = schema
+        self.batch_size = batch_size
+        self.compression = compression
+        self.dictionary_columns = dictionary_columns
+        self.max_open_files = max_open_files
+        self.files: list[Path] = []
+        self.rows_written = 0
+        self._run = uuid.uuid4().hex[:8]
+        self._writers: OrderedDict[Path, ParquetBatchWriter] = OrderedDict()
+
+    def _writer(self, partition: Mapping[str, Any]) -> ParquetBatchWriter:
+        directory = self.root.joinpath(
+            *(
+                f"{key}={_UNSAFE_PATH_CHARACTERS.sub('_', str(value))}"
+                for key, value in partition.items()
+            )
+        )
+        writer = self._writers.get(directory)
+        if writer is not None:
+            self._writers.move_to_end(directory)
+            return writer
+        if len(self._writers) >= self.max_open_files:
+            _, oldest = self._writers.popitem(last=False)
+            self._close(oldest)
+        writer = ParquetBatchWriter(
+            directory / f"part-{self._run}-{len(self.files):05d}.parquet",
+            self.schema,
+            batch_size=self.batch_size,
+            compression=self.compression,
+            dictionary_columns=self.dictionary_columns,
+        )
+        self.files.append(writer.path)
+        self._writers[directory] = writer
+        return writer
+
+    def _close(self, writer: ParquetBatchWriter) -> None:
+        writer.close()
+        self.rows_written += writer.rows_written
+
+    def write(self, row: dict[str, Any], partition: Mapping[str, Any]) -> None:
+        """Add a row to the partition with the given column values."""
+        self._writer(partition).write(row)
+
+    def close(self) -> None:
+        """Finish every open file."""
+        while self._writers:
+            _, writer = self._writers.popitem(last=False)
+            self._close(writer)
+
+    def abort(self) -> None:
+        """Discard the open files; files already finished are kept."""
+        while self._writers:
+            _, writer = self._writers.popitem(last=False)
+            writer.abort()
+            self.files.remove(writer.path)
+
+    def __enter__(self) -> "PartitionedParquetWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()